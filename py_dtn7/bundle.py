@@ -5,13 +5,22 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional, List, Tuple, Union
 
-from py_dtn7.utils import from_dtn_timestamp, RUNNING_MICROPYTHON
+from py_dtn7.utils import _cbor_head, from_dtn_timestamp, RUNNING_MICROPYTHON
 
 if not RUNNING_MICROPYTHON:
-    from cbor2 import dumps, loads
+    from sys import intern
+
+    from cbor2 import dumps, load, loads
 else:
     from cbor import dumps, loads
 
+    def intern(string: str) -> str:
+        return string
+
+    def load(fp):
+        return loads(fp.read())
+
+
 CRC_TYPE_NOCRC = 0
 CRC_TYPE_X25 = 1
 CRC_TYPE_CRC32C = 2
@@ -27,8 +36,46 @@ NONE_ENDPOINT_SPECIFIC_PART_ENCODED = 0
 ENCODING = "utf-8"
 
 
+def _dtn_node_id_to_cbor(specific_part: str) -> bytes:
+    """
+    Encodes a dtn scheme node ID as the CBOR array [1, specific_part] without invoking the generic
+    CBOR encoder
+    """
+    encoded = specific_part.encode(ENCODING)
+    # 0x82: array of two items, 0x01: URI_SCHEME_DTN_ENCODED, 0x60: text string
+    return b"\x82\x01" + _cbor_head(0x60, len(encoded)) + encoded
+
+
+def _intern_specific_part(specific_part: Union[str, int, List[int]]) -> Union[str, int, List[int]]:
+    """
+    Interns dtn endpoint specific parts, as the same few node IDs recur across many bundles and
+    comparing interned strings only takes an identity check. Subclasses of str, which intern()
+    refuses, are kept as they are
+    """
+    if type(specific_part) is str:
+        return intern(specific_part)
+    return specific_part
+
+
+def _count_blocks(blocks: List[CanonicalBlock]) -> dict:
+    """
+    Counts blocks by their class and encoded block data, so block lists can be compared as
+    multisets regardless of their order. Blocks are mutable and their data may be a bytearray, so
+    they cannot be counted by themselves. Block data that only compares equal across types, like 1,
+    1.0 and True, encodes differently and is counted apart.
+    """
+    counts = {}
+    for block in blocks:
+        key = (block.__class__, dumps(block.to_block_data()))
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
 class Flags:
-    flags: int = 0  # repr ignores all class attributes, so flags also needs to be one
+    # as a slot, flags is also a class attribute and thus ignored by __str__
+    __slots__ = ("flags",)
+    # names of the flag properties a subclass adds, set on each subclass by its first __str__
+    _ATTRIBUTES: Tuple[str, ...] = ()
 
     def __init__(self, flags: int = 0):
         if not isinstance(flags, int):
@@ -44,21 +91,53 @@ class Flags:
     def unset_flag(self, bit: int):
         self.flags &= ~(1 << bit)
 
+    def set_mask(self, mask: int):
+        self.flags |= mask
+
+    def unset_mask(self, mask: int):
+        self.flags &= ~mask
+
+    def all_set(self, n_bits: int) -> bool:
+        """
+        :return: True if the lowest n_bits flags are all set
+        """
+        mask = (1 << n_bits) - 1
+        return self.flags & mask == mask
+
+    def none_set(self) -> bool:
+        return self.flags == 0
+
+    def set_all(self, n_bits: int):
+        self.flags |= (1 << n_bits) - 1
+
+    def unset_all(self):
+        self.flags = 0
+
+    def __deepcopy__(self, memo: dict) -> Flags:
+        # flags is an immutable int, so a new instance of the same class is a full copy
+        new = type(self).__new__(type(self))
+        new.flags = self.flags
+        memo[id(self)] = new
+        return new
+
     def __repr__(self) -> str:  # pragma: no cover
         return hex(self.flags)
 
     def __str__(self) -> str:  # pragma: no cover
         if type(self) is Flags:
             return "[__str__ of generic 'Flags' class should not be used]"
-        result = "<{}: [".format(self.__class__.__name__)
-
-        attributes_to_ignore = dir(Flags)
-
-        for attribute in dir(self):
-            if attribute not in attributes_to_ignore:
-                result += "{}: {}, ".format(attribute, getattr(self, attribute))
-
-        return result[:-2] + "]>"
+        cls = self.__class__
+        # looked up in the class itself, as a subclass of a subclass inherits the tuple
+        attributes = cls.__dict__.get("_ATTRIBUTES")
+        if attributes is None:
+            attributes = tuple(a for a in dir(cls) if a not in dir(Flags))
+            cls._ATTRIBUTES = attributes
+        return "<{}: [{}]>".format(
+            cls.__name__,
+            ", ".join(
+                "{}: {}".format(attribute, getattr(self, attribute)) for attribute in attributes
+            ),
+        )
 
     def __eq__(self, other: Flags) -> bool:
         if not isinstance(other, Flags):
@@ -73,26 +152,28 @@ class BundleProcessingControlFlags(Flags):
     particular block of the bundle. They are conveyed in the primary block of the bundle.
     """
 
+    __slots__ = ()
+
     @property
     def is_fragment(self) -> bool:
         """
         :return: True if the bundle is a fragment
         """
-        return self.get_flag(0)
+        return bool(self.flags & (1 << 0))
 
     @property
     def payload_is_admin_record(self) -> bool:
         """
         :return: True if the bundle's payload is an administrative record
         """
-        return self.get_flag(1)
+        return bool(self.flags & (1 << 1))
 
     @property
     def do_not_fragment(self) -> bool:
         """
         :return: True if the bundle must not be fragmented
         """
-        return self.get_flag(2)
+        return bool(self.flags & (1 << 2))
 
     @property
     def reserved_3_to_4(self) -> int:
@@ -106,14 +187,14 @@ class BundleProcessingControlFlags(Flags):
         """
         :return: True if acknowledgment by the user application is requested
         """
-        return self.get_flag(5)
+        return bool(self.flags & (1 << 5))
 
     @property
     def status_time_is_requested(self) -> bool:
         """
         :return: True if status time is requested in all status reports
         """
-        return self.get_flag(6)
+        return bool(self.flags & (1 << 6))
 
     @property
     def reserved_7_to_13(self) -> int:
@@ -127,35 +208,35 @@ class BundleProcessingControlFlags(Flags):
         """
         :return: True if status reporting of bundle reception is requested
         """
-        return self.get_flag(14)
+        return bool(self.flags & (1 << 14))
 
     @property
     def reserved_15(self) -> bool:
         """
         :return: value of bit 15 that is reserved for future use
         """
-        return self.get_flag(15)
+        return bool(self.flags & (1 << 15))
 
     @property
     def status_of_report_forwarding_is_requested(self) -> bool:
         """
         :return: True if status reporting of bundle forwarding is requested
         """
-        return self.get_flag(16)
+        return bool(self.flags & (1 << 16))
 
     @property
     def status_of_report_delivery_is_requested(self) -> bool:
         """
         :return: True if status reporting of bundle delivery is requested
         """
-        return self.get_flag(17)
+        return bool(self.flags & (1 << 17))
 
     @property
     def status_of_report_deletion_is_requested(self) -> bool:
         """
         :return: True if status reporting of bundle deletion is requested
         """
-        return self.get_flag(18)
+        return bool(self.flags & (1 << 18))
 
     @property
     def reserved_19_to_20(self) -> int:
@@ -174,40 +255,42 @@ class BundleProcessingControlFlags(Flags):
 
 
 class BlockProcessingControlFlags(Flags):
+    __slots__ = ()
+
     @property
     def block_must_be_replicated(self) -> bool:
         """
         :return: True if block must be replicated in every fragment
         """
-        return self.get_flag(0)
+        return bool(self.flags & (1 << 0))
 
     @property
     def report_status_if_block_cant_be_processed(self) -> bool:
         """
         :return: True if status report must be transmitted if block can't be processed
         """
-        return self.get_flag(1)
+        return bool(self.flags & (1 << 1))
 
     @property
     def delete_bundle_if_block_cant_be_processed(self) -> bool:
         """
         :return: True if bundle shall be deleted if block can't be processed
         """
-        return self.get_flag(2)
+        return bool(self.flags & (1 << 2))
 
     @property
     def reserved_3(self) -> bool:
         """
         :return: value of bit 3 that is reserved for future use
         """
-        return self.get_flag(3)
+        return bool(self.flags & (1 << 3))
 
     @property
     def discard_block_if_block_cant_be_processed(self) -> bool:
         """
         :return: True if block shall be discarded of block can't be processed
         """
-        return self.get_flag(4)
+        return bool(self.flags & (1 << 4))
 
     @property
     def reserved_5_to_6(self) -> int:
@@ -244,6 +327,21 @@ class PrimaryBlock:
        they MUST appear:
     """
 
+    __slots__ = (
+        "version",
+        "bundle_processing_control_flags",
+        "crc_type",
+        "destination_scheme",
+        "destination_specific_part",
+        "source_scheme",
+        "source_specific_part",
+        "report_to_scheme",
+        "report_to_specific_part",
+        "bundle_creation_time",
+        "sequence_number",
+        "lifetime",
+    )
+
     def __init__(
         self,
         version: int,
@@ -266,11 +364,11 @@ class PrimaryBlock:
         self.bundle_processing_control_flags = bundle_processing_control_flags
         self.crc_type = crc_type
         self.destination_scheme = destination_scheme
-        self.destination_specific_part = destination_specific_part
+        self.destination_specific_part = _intern_specific_part(destination_specific_part)
         self.source_scheme = source_scheme
-        self.source_specific_part = source_specific_part
+        self.source_specific_part = _intern_specific_part(source_specific_part)
         self.report_to_scheme = report_to_scheme
-        self.report_to_specific_part = report_to_specific_part
+        self.report_to_specific_part = _intern_specific_part(report_to_specific_part)
         self.bundle_creation_time = bundle_creation_time
         self.sequence_number = sequence_number
         self.lifetime = lifetime
@@ -301,24 +399,28 @@ class PrimaryBlock:
             )
         )
 
+    def __deepcopy__(self, memo: dict) -> PrimaryBlock:
+        # all fields are immutable except the flags and ipn specific parts, skip the generic
+        # deepcopy traversal and the checks in __init__
+        new = object.__new__(type(self))
+        memo[id(self)] = new
+        for field in PrimaryBlock.__slots__:
+            value = getattr(self, field)
+            if isinstance(value, list):
+                value = list(value)
+            setattr(new, field, value)
+        flags = self.bundle_processing_control_flags
+        flags_copy = memo.get(id(flags))
+        new.bundle_processing_control_flags = (
+            flags.__deepcopy__(memo) if flags_copy is None else flags_copy
+        )
+        return new
+
     def __eq__(self, other: PrimaryBlock) -> bool:
         if not isinstance(other, PrimaryBlock):
             return NotImplemented
-        attrs = [
-            "version",
-            "bundle_processing_control_flags",
-            "crc_type",
-            "destination_scheme",
-            "destination_specific_part",
-            "source_scheme",
-            "source_specific_part",
-            "report_to_scheme",
-            "report_to_specific_part",
-            "bundle_creation_time",
-            "sequence_number",
-            "lifetime",
-        ]
-        return all(getattr(self, attr) == getattr(other, attr) for attr in attrs)
+        # the block data holds every field, so comparing it is a single tuple comparison
+        return self.to_block_data() == other.to_block_data()
 
     @staticmethod
     def from_block_data(primary_block: list) -> PrimaryBlock:
@@ -373,13 +475,14 @@ class PrimaryBlock:
         full_destination_uri: str,
         full_source_uri: str = "dtn://none",
         full_report_to_uri: str = "dtn://none",
-        bundle_processing_control_flags: BundleProcessingControlFlags = BundleProcessingControlFlags(
-            0
-        ),
+        bundle_processing_control_flags: Optional[BundleProcessingControlFlags] = None,
         bundle_creation_time: int = 0,
         sequence_number: int = 0,
         lifetime: int = 3600 * 24 * 1000,
     ):
+        if bundle_processing_control_flags is None:
+            bundle_processing_control_flags = BundleProcessingControlFlags(0)
+
         primary_block = PrimaryBlock(
             version=7,
             bundle_processing_control_flags=bundle_processing_control_flags,
@@ -432,7 +535,7 @@ class PrimaryBlock:
                 specific_part = NONE_ENDPOINT_SPECIFIC_PART_ENCODED
             else:
                 specific_part = tuple(int(x) for x in specific_part[2:].split("."))
-                if len(specific_part) != 2 or any([x < 0 for x in specific_part]):
+                if len(specific_part) != 2 or any(x < 0 for x in specific_part):
                     raise ValueError(
                         "IPN scheme only allows pairs of unsigned integers as endpoint IDs"
                     )
@@ -451,7 +554,7 @@ class PrimaryBlock:
             if specific_part == NONE_ENDPOINT_SPECIFIC_PART_ENCODED:
                 specific_part = NONE_ENDPOINT_SPECIFIC_PART_NAME
             else:
-                if len(specific_part) != 2 or any([x < 0 for x in specific_part]):
+                if len(specific_part) != 2 or any(x < 0 for x in specific_part):
                     raise ValueError(
                         "IPN scheme only allows pairs of unsigned integers as endpoint IDs"
                     )
@@ -487,6 +590,14 @@ class PrimaryBlock:
 
 
 class CanonicalBlock:
+    __slots__ = (
+        "block_type_code",
+        "block_number",
+        "block_processing_control_flags",
+        "crc_type",
+        "data",
+    )
+
     def __init__(
         self,
         block_type_code: int,
@@ -517,14 +628,7 @@ class CanonicalBlock:
             return NotImplemented
         if self.__class__ is not other.__class__:
             return False
-        attrs = [
-            "block_type_code",
-            "block_number",
-            "block_processing_control_flags",
-            "crc_type",
-            "data",
-        ]
-        return all(getattr(self, attr) == getattr(other, attr) for attr in attrs)
+        return self.to_block_data() == other.to_block_data()
 
     @classmethod
     def from_block_data(cls, block: list) -> CanonicalBlock:
@@ -544,24 +648,13 @@ class CanonicalBlock:
 
         block_type = block[0]
 
-        if block_type == 1:
-            if cls is not CanonicalBlock and cls is not PayloadBlock:
-                raise ValueError("'block_type_code' 1 not correct for instantiating {}".format(cls))
-            cls = PayloadBlock
-        elif block_type == 6:
-            if cls is not CanonicalBlock and cls is not PreviousNodeBlock:
-                raise ValueError("'block_type_code' 6 not correct for instantiating {}".format(cls))
-            cls = PreviousNodeBlock
-        elif block_type == 7:
-            if cls is not CanonicalBlock and cls is not BundleAgeBlock:
-                raise ValueError("'block_type_code' 7 not correct for instantiating {}".format(cls))
-            cls = BundleAgeBlock
-        elif block_type == 10:
-            if cls is not CanonicalBlock and cls is not HopCountBlock:
+        block_class = _CANONICAL_BLOCK_CLASSES.get(block_type)
+        if block_class is not None:
+            if cls is not CanonicalBlock and cls is not block_class:
                 raise ValueError(
-                    "'block_type_code' 10 not correct for instantiating {}".format(cls)
+                    "'block_type_code' {} not correct for instantiating {}".format(block_type, cls)
                 )
-            cls = HopCountBlock
+            cls = block_class
         elif 11 <= block_type <= 191:
             print(
                 "warning: unassigned block type {} used without a dedicated implementation".format(
@@ -607,13 +700,16 @@ class PayloadBlock(CanonicalBlock):
     Provides no definition about the transported payload data.
     """
 
+    __slots__ = ()
+
     @staticmethod
     def from_objects(
         data: bytes,
-        block_processing_control_flags: BlockProcessingControlFlags = BlockProcessingControlFlags(
-            0
-        ),
+        block_processing_control_flags: Optional[BlockProcessingControlFlags] = None,
     ):
+        if block_processing_control_flags is None:
+            block_processing_control_flags = BlockProcessingControlFlags(0)
+
         return PayloadBlock(
             block_type_code=1,
             block_number=1,
@@ -633,6 +729,8 @@ class PreviousNodeBlock(CanonicalBlock):
     At most once in a bundle otherwise.
     """
 
+    __slots__ = ()
+
     @property
     def previous_node_id(self) -> Tuple[int, Union[str, int, List[int]]]:
         """
@@ -643,16 +741,23 @@ class PreviousNodeBlock(CanonicalBlock):
     @staticmethod
     def from_objects(
         full_node_uri: str,
-        block_processing_control_flags: BlockProcessingControlFlags = BlockProcessingControlFlags(
-            0
-        ),
+        block_processing_control_flags: Optional[BlockProcessingControlFlags] = None,
     ):
+        if block_processing_control_flags is None:
+            block_processing_control_flags = BlockProcessingControlFlags(0)
+
+        scheme, specific_part = PrimaryBlock.from_full_uri(full_node_uri)
+        if scheme == URI_SCHEME_DTN_ENCODED and isinstance(specific_part, str):
+            data = _dtn_node_id_to_cbor(specific_part)
+        else:
+            data = dumps((scheme, specific_part))
+
         return PreviousNodeBlock(
             block_type_code=6,
             block_number=1,
             block_processing_control_flags=block_processing_control_flags,
             crc_type=0,
-            data=dumps(PrimaryBlock.from_full_uri(full_node_uri)),
+            data=data,
             crc=None,
         )
 
@@ -670,6 +775,8 @@ class BundleAgeBlock(CanonicalBlock):
     At most once in a bundle if the creation time is not zero.
     """
 
+    __slots__ = ()
+
     @property
     def age_milliseconds(self) -> int:
         """
@@ -684,10 +791,11 @@ class BundleAgeBlock(CanonicalBlock):
     @staticmethod
     def from_objects(
         age_milliseconds: int = 0,
-        block_processing_control_flags: BlockProcessingControlFlags = BlockProcessingControlFlags(
-            0
-        ),
+        block_processing_control_flags: Optional[BlockProcessingControlFlags] = None,
     ):
+        if block_processing_control_flags is None:
+            block_processing_control_flags = BlockProcessingControlFlags(0)
+
         return BundleAgeBlock(
             block_type_code=7,
             block_number=1,
@@ -710,6 +818,8 @@ class HopCountBlock(CanonicalBlock):
     At most once in a bundle.
     """
 
+    __slots__ = ()
+
     @property
     def hop_limit(self) -> int:
         """
@@ -734,10 +844,11 @@ class HopCountBlock(CanonicalBlock):
     def from_objects(
         hop_limit: int,
         hop_count: int,
-        block_processing_control_flags: BlockProcessingControlFlags = BlockProcessingControlFlags(
-            0
-        ),
+        block_processing_control_flags: Optional[BlockProcessingControlFlags] = None,
     ):
+        if block_processing_control_flags is None:
+            block_processing_control_flags = BlockProcessingControlFlags(0)
+
         return HopCountBlock(
             block_type_code=10,
             block_number=1,
@@ -759,6 +870,15 @@ class HopCountBlock(CanonicalBlock):
         )
 
 
+# block type codes that have a dedicated canonical block implementation
+_CANONICAL_BLOCK_CLASSES = {
+    1: PayloadBlock,
+    6: PreviousNodeBlock,
+    7: BundleAgeBlock,
+    10: HopCountBlock,
+}
+
+
 class Bundle:
     """
     Standard BP7 Bundle implementation.
@@ -766,6 +886,27 @@ class Bundle:
     This implementation is not thread-safe!
     """
 
+    __slots__ = (
+        "primary_block",
+        "previous_node_block",
+        "bundle_age_block",
+        "hop_count_block",
+        "payload_block",
+        "other_blocks",
+        "_cur_block_number",
+        "_bundle_id",
+        "_bundle_id_key",
+    )
+
+    # maps the exact block classes to the fields holding them
+    _BLOCK_TYPE_FIELDS = {
+        PreviousNodeBlock: "previous_node_block",
+        BundleAgeBlock: "bundle_age_block",
+        HopCountBlock: "hop_count_block",
+        PayloadBlock: "payload_block",
+        CanonicalBlock: "other_blocks",
+    }
+
     def __init__(
         self,
         primary_block: PrimaryBlock,
@@ -773,7 +914,7 @@ class Bundle:
         bundle_age_block: Optional[BundleAgeBlock] = None,
         hop_count_block: Optional[HopCountBlock] = None,
         payload_block: Optional[PayloadBlock] = None,
-        other_blocks: Optional[List[CanonicalBlock]] = [],
+        other_blocks: Optional[List[CanonicalBlock]] = None,
     ):
         self.primary_block = primary_block
         self.previous_node_block: Optional[PreviousNodeBlock] = None
@@ -783,13 +924,11 @@ class Bundle:
         self.other_blocks: Optional[List[CanonicalBlock]] = []
 
         self._cur_block_number = 2
-        self._block_type_dict = {
-            PreviousNodeBlock: "previous_node_block",
-            BundleAgeBlock: "bundle_age_block",
-            HopCountBlock: "hop_count_block",
-            PayloadBlock: "payload_block",
-            CanonicalBlock: "other_blocks",
-        }
+        self._bundle_id: Optional[str] = None
+        self._bundle_id_key: Optional[tuple] = None
+
+        if other_blocks is None:
+            other_blocks = []
 
         for block in (previous_node_block, bundle_age_block, hop_count_block, payload_block) + tuple(other_blocks):
             if block is not None:
@@ -809,6 +948,18 @@ class Bundle:
         blocks = loads(data)
         return Bundle.from_block_data(blocks)
 
+    @staticmethod
+    def from_cbor_stream(fp) -> Bundle:
+        """
+        Create a new Bundle object from valid CBOR data read from a file-like object. The data is
+        decoded while it is read, so it does not have to be buffered in full beforehand
+        :param fp: file-like object providing the bundle data as CBOR byte-string
+        :return: a bundle object constructed from the read data
+        """
+
+        blocks = load(fp)
+        return Bundle.from_block_data(blocks)
+
     @staticmethod
     def from_block_data(blocks: list) -> Bundle:
         """
@@ -848,60 +999,81 @@ class Bundle:
         )
 
     def insert_canonical_block(self, block: CanonicalBlock):
+        block_type = type(block)  # returns exact type
+
         # overwrite block number with correct value
-        if isinstance(block, PayloadBlock):
+        if block_type is PayloadBlock:
             block.block_number = 1
         else:
             block.block_number = self._cur_block_number
             self._cur_block_number += 1  # TBD: make this thread-safe
 
         # assign block to appropriate field
-        block_type = type(block)  # returns exact type
-        try:
-            block_field = self._block_type_dict[block_type]
-        except KeyError:
+        block_field = self._BLOCK_TYPE_FIELDS.get(block_type)
+        if block_field is None:
             raise ValueError("Unknown block type '{}'.".format(block_type.__name__))
         if block_type is not CanonicalBlock:
-            if getattr(self, block_field) is None:
-                setattr(self, block_field, block)
-            else:
-                raise ValueError(format("{} already present in this bundle", block_type.__name__))
+            if getattr(self, block_field) is not None:
+                raise ValueError("{} already present in this bundle".format(block_type.__name__))
+            setattr(self, block_field, block)
+        elif self.other_blocks is None:
+            self.other_blocks = [block]
         else:
-            try:
-                self.other_blocks.append(block)
-            except AttributeError:  # self.other_blocks is probably None
-                self.other_blocks = [block]
+            self.other_blocks.append(block)
 
     def remove_block(self, block):
-        if self.primary_block == block:
-            self.primary_block = None
-        elif self.previous_node_block == block:
-            self.previous_node_block = None
-        elif self.bundle_age_block == block:
-            self.bundle_age_block = None
-        elif self.hop_count_block == block:
-            self.hop_count_block = None
-        elif self.payload_block == block:
-            self.payload_block = None
-        elif block in self.other_blocks:
-            self.other_blocks.remove(block)
+        # identity is checked first, as usually the very block object of this bundle is passed
+        if isinstance(block, PrimaryBlock):
+            if self.primary_block is block or self.primary_block == block:
+                self.primary_block = None
+            return
+
+        # only the field matching the block type can hold the block, so only that one is compared
+        block_type = type(block)
+        block_field = self._BLOCK_TYPE_FIELDS.get(block_type)
+        if block_field is None:
+            return
+        if block_type is CanonicalBlock:
+            try:
+                self.other_blocks.remove(block)  # list.remove() also checks identity first
+            except ValueError:  # block is not part of this bundle
+                pass
+        else:
+            current_block = getattr(self, block_field)
+            if current_block is block or current_block == block:
+                setattr(self, block_field, None)
 
     @property
     def bundle_id(self) -> str:
         """
         :return: the bundle ID of the bundle
         """
-        return "{}-{}-{}".format(
-            self.primary_block.full_source_uri,
-            self.primary_block.bundle_creation_time,
-            self.primary_block.sequence_number,
+        # the primary block is mutable, so the cached ID is only reused as long as the fields it
+        # is derived from are unchanged
+        primary_block = self.primary_block
+        source_specific_part = primary_block.source_specific_part
+        if isinstance(source_specific_part, list):
+            # ipn specific parts can be changed in place, so the key holds a snapshot of them
+            source_specific_part = tuple(source_specific_part)
+        key = (
+            primary_block.source_scheme,
+            source_specific_part,
+            primary_block.bundle_creation_time,
+            primary_block.sequence_number,
         )
+        if key != self._bundle_id_key:
+            self._bundle_id = "{}-{}-{}".format(
+                primary_block.full_source_uri,
+                primary_block.bundle_creation_time,
+                primary_block.sequence_number,
+            )
+            self._bundle_id_key = key
+        return self._bundle_id
 
     def __repr__(self) -> str:  # pragma: no cover
-        return "<{}: {}>".format(
-            self.__class__.__name__,
-            [self.primary_block] + list(self._get_all_used_canonical_blocks()),
-        )  # noqa
+        blocks = [self.primary_block]
+        blocks.extend(self._get_all_used_canonical_blocks())
+        return "<{}: {}>".format(self.__class__.__name__, blocks)
 
     def __eq__(self, other: Bundle) -> bool:
         if self.__class__ is not other.__class__:
@@ -914,19 +1086,27 @@ class Bundle:
             "payload_block",
             # other_blocks needs to be handled seperately
         ]
+        for attr in attrs:
+            if getattr(self, attr) != getattr(other, attr):
+                return False
         # other_blocks have to be the same but not in the same order
-        other_equal = all(b in other.other_blocks for b in self.other_blocks) and all(
-            b in self.other_blocks for b in other.other_blocks
-        )
-        return other_equal and all(getattr(self, attr) == getattr(other, attr) for attr in attrs)
+        if len(self.other_blocks) != len(other.other_blocks):
+            return False
+        if self.other_blocks == other.other_blocks:
+            return True
+        return _count_blocks(self.other_blocks) == _count_blocks(other.other_blocks)
 
-    def _get_all_used_canonical_blocks(self):
-        all_canonical_blocks = (
+    def _get_all_used_canonical_blocks(self) -> tuple:
+        # not cached, since the block fields and other_blocks can be changed from outside
+        fixed_blocks = (
             self.previous_node_block,
             self.bundle_age_block,
             self.hop_count_block,
             self.payload_block,
         )
-        all_canonical_blocks += tuple(self.other_blocks)
-
-        return (block for block in all_canonical_blocks if block is not None)
+        return tuple(
+            block
+            for blocks in (fixed_blocks, self.other_blocks)
+            for block in blocks
+            if block is not None
+        )
@@ -1,17 +1,39 @@
-import json
-from typing import ClassVar, List, Optional, Union
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple, Union
 
 from py_dtn7 import Bundle
 from py_dtn7.utils import RUNNING_MICROPYTHON
 
 if not RUNNING_MICROPYTHON:
+    from concurrent.futures import ThreadPoolExecutor
+    from io import BufferedReader
+
+    try:
+        # orjson parses the status responses considerably faster, use it when it is installed
+        from orjson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
+
+    from time import monotonic
+
     import requests
+    from requests.adapters import HTTPAdapter
 else:
+    from json import loads as json_loads
+    from time import time as monotonic
+
     import urequests as requests
 
 
 def has_valid_schema(host: str):
-    return host.startswith("https://") or host.startswith("http://")
+    return host.startswith(("https://", "http://"))
+
+
+# request arguments for each supported payload type, keyed by the exact type of the payload
+_PAYLOAD_ENCODERS = {
+    str: lambda payload, encoding: {"data": payload.encode(encoding or "utf-8")},
+    dict: lambda payload, encoding: {"json": payload},
+    bytes: lambda payload, encoding: {"data": payload},
+}
 
 
 class DTNRESTClient:
@@ -30,6 +52,11 @@ class DTNRESTClient:
     STATUS_PEERS: ClassVar[str] = "/status/peers"
     STATUS_STORE: ClassVar[str] = "/status/store"
 
+    # number of bundles downloaded concurrently by get_all_bundles()
+    DOWNLOAD_WORKERS: ClassVar[int] = 8
+    # seconds a fetched peer list is reused, e.g. when sending to several peers by name
+    PEERS_CACHE_TTL: ClassVar[float] = 1.0
+
     def __init__(
         self,
         host: Optional[str] = None,
@@ -41,14 +68,71 @@ class DTNRESTClient:
             host = "http://localhost"
 
         if has_valid_schema(host):
-            if host.endswith("/"):
-                host = host[:-1]
+            host = host.rstrip("/")
             self._host = host
         else:
             raise ValueError("Host attribute must start either with 'http://' or 'https://'")
 
         self._port = port
+        # URL prefixes are built once, request methods only append the query
+        self._base_url: str = f"{host}:{port}"
+        self._download_url: str = f"{self._base_url}{self.DOWNLOAD_ENDPOINT}?"
+        self._send_url: str = f"{self._base_url}{self.SEND_ENDPOINT}?dst="
+        self._push_url: str = f"{self._base_url}{self.PUSH_ENDPOINT}"
+        self._register_url: str = f"{self._base_url}{self.REGISTER_ENDPOINT}?"
+        self._unregister_url: str = f"{self._base_url}{self.UNREGISTER_ENDPOINT}?"
+        self._endpoint_url: str = f"{self._base_url}{self.ENDPOINT_ENDPOINT}?"
+        self._filter_bundles_url: str = f"{self._base_url}{self.STATUS_FILTER_BUNDLES}?addr="
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        # peer name -> "dtn:<node>" prefix, rebuilt whenever the cached peer list is refetched
+        self._peer_node_ids: Dict[str, str] = {}
+        # the peer list _peer_node_ids was built from
+        self._peer_node_ids_source: Optional[dict] = None
+        # bundle ID -> CBOR data of bundles downloaded by get_all_bundles()
+        self._bundle_data: Dict[str, bytes] = {}
+        # reuse connections across requests; urequests has no sessions, so there the module
+        # level functions are used
+        if RUNNING_MICROPYTHON:
+            self._session = requests
+        else:
+            self._session = requests.Session()
+            # keep one pooled connection per concurrent download
+            adapter = HTTPAdapter(pool_maxsize=self.DOWNLOAD_WORKERS)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        self._nodeid = self._get_nodeid()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the connections kept open for reuse
+        """
+        if not RUNNING_MICROPYTHON:
+            self._session.close()
+
+    def refresh_node_id(self) -> str:
+        """
+        Fetches the node ID from DTNd again, e.g. after the daemon was restarted with a new ID.
+        The node_id property itself never causes a request.
+        :return: the current node ID
+        """
         self._nodeid = self._get_nodeid()
+        return self._nodeid
+
+    def invalidate_cache(self) -> None:
+        """
+        Drops all cached status responses and bundles, so the next access fetches them from DTNd
+        again
+        """
+        self._cache.clear()
+        self._peer_node_ids.clear()
+        self._peer_node_ids_source = None
+        self._bundle_data.clear()
 
     def send(
         self,
@@ -59,52 +143,32 @@ class DTNRESTClient:
         lifetime: Optional[int] = None,
         encoding: Optional[str] = None,
     ) -> requests.Response:
+        encoder = _PAYLOAD_ENCODERS.get(type(payload))
+        if encoder is None:
+            raise ValueError("Payload must by of type 'bytes', 'dict' or 'str'.")
         dst: str = ""
 
         if destination is not None:
             dst = destination
         elif peer_name is not None and endpoint is not None:
-            peers = self.peers
-            if peer_name in peers.keys():
-                dst = f"dtn:{peers[peer_name]['eid'][1]}{endpoint}"
-            else:
-                known_peers: str = ", ".join([k for k in peers.keys()])
-                raise ValueError(f"Unknown peer name passed. Known peers: {known_peers}")
-        url: str = f"{self._host}:{self._port}{self.SEND_ENDPOINT}?dst={dst}"
+            dst = self._resolve_peer(peer_name) + endpoint
+        url: str = self._send_url + dst
         if lifetime is not None:
             url += f"&lifetime={lifetime}"
-        if type(payload) is str:
-            if encoding is None:
-                encoding = "utf-8"
-            response: requests.Response = requests.post(
-                url=url, data=payload.encode(encoding=encoding)
-            )
-        elif type(payload) is dict:
-            response: requests.Response = requests.post(url=url, json=payload)
-        elif type(payload) is bytes:
-            response: requests.Response = requests.post(url=url, data=payload)
-        else:
-            raise ValueError("Payload must by of type 'bytes', 'dict' or 'str'.")
-
-        return response
+        return self._session.post(url=url, **encoder(payload, encoding))
 
     def push(self, bundle: bytes):
-        url = "{}:{}{}".format(self._host, self._port, self.PUSH_ENDPOINT)
-        return requests.post(url=url, data=bundle)
+        return self._session.post(url=self._push_url, data=bundle)
 
     def register(self, endpoint: str) -> requests.Response:
-        response: requests.Response = requests.get(
-            url=f"{self._host}:{self._port}{self.REGISTER_ENDPOINT}?{endpoint}"
-        )
+        response: requests.Response = self._session.get(url=self._register_url + endpoint)
         result: str = response.content.decode("utf-8").lower()
         if "registered" not in result or endpoint.lower() not in result:
             raise RuntimeError(f'Something went wrong, endpoint "{endpoint}" not registered')
         return response
 
     def unregister(self, endpoint: str) -> requests.Response:
-        response: requests.Response = requests.get(
-            url=f"{self._host}:{self._port}{self.UNREGISTER_ENDPOINT}?{endpoint}"
-        )
+        response: requests.Response = self._session.get(url=self._unregister_url + endpoint)
         result: str = response.content.decode("utf-8").lower()
         if "unregistered" not in result or endpoint not in result:
             raise RuntimeError(f'Something went wrong, endpoint "{endpoint}" not unregistered')
@@ -113,17 +177,62 @@ class DTNRESTClient:
     def get_all_bundles(self) -> List[Bundle]:
         """
         Gets all bundles as Bundle objects from the DTNd store. This can cause very much traffic
-        so be sure to use with care.
+        so be sure to use with care. Bundles already downloaded by a previous call are not
+        downloaded again.
         :return: all Bundles that are in the DTNd store
         """
+        bundle_ids: List[str] = self._raw_bundles
+        # keep only bundles that are still in the store
+        known: Dict[str, bytes] = {
+            bid: self._bundle_data[bid] for bid in bundle_ids if bid in self._bundle_data
+        }
+        new_ids: List[str] = [bid for bid in bundle_ids if bid not in known]
+        download_url: str = self._download_url
+        urls: List[str] = [download_url + bid for bid in new_ids]
+        if RUNNING_MICROPYTHON or len(urls) < 2:
+            responses = [self._session.get(url=url) for url in urls]
+        else:
+            # downloads are I/O bound, so they are run concurrently while decoding stays here.
+            # The workers share the session: they only issue plain GETs and never change its
+            # headers, auth or adapters. The state they do share is the urllib3 connection pool,
+            # which is thread-safe and sized to DOWNLOAD_WORKERS, and the cookie jar, which
+            # guards its updates with a lock
+            with ThreadPoolExecutor(max_workers=self.DOWNLOAD_WORKERS) as executor:
+                responses = list(executor.map(self._session.get, urls))
+        fetched: Dict[str, bytes] = {}
+        for bid, response in zip(new_ids, responses):
+            fetched[bid] = response.content
+            if response.status_code == 200:
+                known[bid] = fetched[bid]
+        self._bundle_data = known
+        # Bundle objects are mutable, so every call decodes fresh ones from the stored data
         return [
-            Bundle.from_cbor(bundle.content)
-            for bundle in [
-                requests.get(url=f"{self._host}:{self._port}{self.DOWNLOAD_ENDPOINT}?{burl}")
-                for burl in self._raw_bundles
-            ]
+            Bundle.from_cbor(known[bid] if bid in known else fetched[bid]) for bid in bundle_ids
         ]
 
+    def iter_bundles(self) -> Iterator[Bundle]:
+        """
+        Yields all bundles from the DTNd store one by one as Bundle objects. Each bundle is decoded
+        while it is downloaded (or after it, if the DTNd compressed it), so only a single bundle is
+        held in memory at a time.
+        :return: generator over all Bundles that are in the DTNd store
+        """
+        download_url: str = self._download_url
+        for burl in self._raw_bundles:
+            response = self._session.get(url=download_url + burl, stream=True)
+            try:
+                if RUNNING_MICROPYTHON:
+                    yield Bundle.from_cbor_stream(response.raw)
+                elif response.headers.get("Content-Encoding"):
+                    # while urllib3 decompresses a body its reads can come back short or even
+                    # empty, which cbor2 takes for the end of the stream, so requests decodes it
+                    yield Bundle.from_cbor(response.content)
+                else:
+                    # the buffered reader fills each read of the decoder however the body arrives
+                    yield Bundle.from_cbor_stream(BufferedReader(response.raw))
+            finally:
+                response.close()
+
     def get_filtered_bundles(self, address_part_criteria: str) -> List[str]:
         """
 
@@ -131,14 +240,10 @@ class DTNRESTClient:
         :return:
         """
         try:
-            bundles: List[str] = json.loads(
-                requests.get(
-                    url="{}:{}{}?addr={}".format(
-                        self._host, self._port, self.STATUS_FILTER_BUNDLES, address_part_criteria
-                    )
-                ).content
+            bundles: List[str] = json_loads(
+                self._session.get(url=self._filter_bundles_url + address_part_criteria).content
             )
-        except json.decoder.JSONDecodeError:
+        except ValueError:
             # either no or invalid response received so just return empty list
             return []
 
@@ -154,9 +259,7 @@ class DTNRESTClient:
     def fetch_endpoint(self, endpoint: str = None) -> bytes:
         if endpoint is None:
             endpoint = self._nodeid
-        return requests.get(
-            url=f"{self._host}:{self._port}{self.ENDPOINT_ENDPOINT}?{endpoint}"
-        ).content
+        return self._session.get(url=self._endpoint_url + endpoint).content
 
     def download(
         self,
@@ -177,11 +280,7 @@ class DTNRESTClient:
                 if peer_name is None:
                     node_id = self._nodeid
                 else:
-                    peers = self.peers
-                    if peer_name in peers.keys():
-                        node_id = f"dtn:{peers[peer_name]['eid'][1]}"
-                    else:
-                        raise ValueError("Peer not found")
+                    node_id = self._resolve_peer(peer_name)
             else:
                 if node_id[-1] != "/":
                     node_id = f"{node_id}/"
@@ -189,17 +288,15 @@ class DTNRESTClient:
 
         if host is None:
             if port is None:
-                host = self._host
-                port = self._port
+                return self._session.get(url=self._download_url + bundle_id).content
             else:
                 raise ValueError("Host and port must either both be defined or undefined.")
         else:
             if not has_valid_schema(host):
                 raise ValueError("Host attribute must start either with 'http://' or 'https://'")
-            if host[-1] == "/":
-                host = host[:-1]
+            host = host.rstrip("/")
 
-        return requests.get(url=f"{host}:{port}{self.DOWNLOAD_ENDPOINT}?{bundle_id}").content
+        return self._session.get(url=f"{host}:{port}{self.DOWNLOAD_ENDPOINT}?{bundle_id}").content
 
     @property
     def host(self) -> str:
@@ -211,9 +308,7 @@ class DTNRESTClient:
 
     @property
     def endpoints(self) -> list:
-        eps: list = json.loads(
-            requests.get(url=f"{self._host}:{self._port}{self.STATUS_EIDS}").content
-        )
+        eps: list = self._get_json(self.STATUS_EIDS)
         # eps = list(map(lambda ep: ep.rsplit("/", 1)[1], eps))
         return eps
 
@@ -223,21 +318,23 @@ class DTNRESTClient:
 
     @property
     def _raw_bundles(self) -> List[str]:
-        return json.loads(
-            requests.get(url=f"{self._host}:{self._port}{self.STATUS_BUNDLES}").content
-        )
+        return self._get_json(self.STATUS_BUNDLES)
 
     @property
     def store(self) -> list:
-        return json.loads(requests.get(url=f"{self._host}:{self._port}{self.STATUS_STORE}").content)
+        return self._get_json(self.STATUS_STORE)
 
     @property
     def info(self) -> dict:
-        return json.loads(requests.get(url=f"{self._host}:{self._port}{self.STATUS_INFO}").content)
+        return self._get_json(self.STATUS_INFO)
 
     @property
     def peers(self) -> dict:
-        return json.loads(requests.get(url=f"{self._host}:{self._port}{self.STATUS_PEERS}").content)
+        """
+        :return: the peers known to DTNd by name, as a copy of the cached peer list whose
+        entries are still shared with the cache and must not be changed
+        """
+        return dict(self._get_json(self.STATUS_PEERS, ttl=self.PEERS_CACHE_TTL))
 
     @property
     def node_id(self) -> str:
@@ -249,7 +346,39 @@ class DTNRESTClient:
     def __repl__(self):
         return f"<DTNClient@{self._host}:{self._port}, node ID: {self._nodeid}>"
 
+    def _get_json(self, endpoint: str, ttl: float = 0) -> Any:
+        """
+        Fetches and decodes the JSON response of a status endpoint
+        :param endpoint: the endpoint to query
+        :param ttl: seconds a previous response of the endpoint may be reused, 0 disables caching
+        :return: the decoded response
+        """
+        now: float = monotonic()
+        if ttl > 0:
+            cached = self._cache.get(endpoint)
+            if cached is not None and now - cached[0] < ttl:
+                return cached[1]
+        value = json_loads(self._session.get(url=self._base_url + endpoint).content)
+        if ttl > 0:
+            self._cache[endpoint] = (now, value)
+        return value
+
+    def _resolve_peer(self, peer_name: str) -> str:
+        """
+        Looks up the node ID of a peer by its name
+        :param peer_name: name of the peer as listed by DTNd
+        :return: the node ID of the peer in the form "dtn:<specific part>"
+        """
+        # the peer list is cached for PEERS_CACHE_TTL, so the node IDs are only rebuilt when it
+        # was actually fetched again
+        peers: dict = self._get_json(self.STATUS_PEERS, ttl=self.PEERS_CACHE_TTL)
+        if peers is not self._peer_node_ids_source:
+            self._peer_node_ids = {name: f"dtn:{peer['eid'][1]}" for name, peer in peers.items()}
+            self._peer_node_ids_source = peers
+        node_id: Optional[str] = self._peer_node_ids.get(peer_name)
+        if node_id is None:
+            raise ValueError(f"Unknown peer name passed. Known peers: {', '.join(peers)}")
+        return node_id
+
     def _get_nodeid(self) -> Optional[str]:
-        return requests.get(url=f"{self._host}:{self._port}{self.STATUS_NODEID}").content.decode(
-            "utf-8"
-        )
+        return self._session.get(url=self._base_url + self.STATUS_NODEID).content.decode("utf-8")
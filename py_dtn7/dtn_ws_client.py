@@ -1,5 +1,6 @@
 import json
-from base64 import b64encode
+import logging
+import socket
 from enum import Enum
 from typing import Any, Callable, ClassVar, Iterable, List, Optional, Union
 from urllib import request as rq
@@ -8,10 +9,107 @@ import cbor2 as cbor
 from websocket import ABNF, WebSocket, WebSocketApp
 
 from py_dtn7 import Bundle
+from py_dtn7.utils import _cbor_head
+
+try:
+    # pybase64 encodes with SIMD instructions, use it when it is installed
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+try:
+    # orjson serializes considerably faster and directly to bytes, use it when it is installed
+    from orjson import dumps as _json_dumps
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+_logger = logging.getLogger(__name__)
+
+# text string keys of the bundle map sent in data mode, each prefixed by its CBOR head
+_CBOR_SRC: bytes = b"\x63src"
+_CBOR_DST: bytes = b"\x63dst"
+_CBOR_DELIVERY_NOTIFICATION: bytes = b"\x75delivery_notification"
+_CBOR_LIFETIME: bytes = b"\x68lifetime"
+_CBOR_DATA: bytes = b"\x64data"
+
+
+def _bundle_to_cbor(
+    src: Any, dst: Any, delivery_notification: Any, lifetime: Any, data: Any
+) -> bytes:
+    """
+    Encodes the bundle map sent in data mode exactly like cbor2 does, but without walking a dict.
+    Values of other types than expected are left to cbor2.
+    """
+    if (
+        type(src) is not str
+        or type(dst) is not str
+        or type(delivery_notification) is not bool
+        or type(lifetime) is not int
+        or not 0 <= lifetime < 0x10000000000000000
+        or type(data) not in (bytes, bytearray, memoryview)
+    ):
+        return cbor.dumps(
+            {
+                "src": src,
+                "dst": dst,
+                "delivery_notification": delivery_notification,
+                "lifetime": lifetime,
+                "data": data,
+            }
+        )
+    src_encoded: bytes = src.encode()
+    dst_encoded: bytes = dst.encode()
+    return b"".join(
+        (
+            b"\xa5",  # map of five pairs
+            _CBOR_SRC,
+            _cbor_head(0x60, len(src_encoded)),
+            src_encoded,
+            _CBOR_DST,
+            _cbor_head(0x60, len(dst_encoded)),
+            dst_encoded,
+            _CBOR_DELIVERY_NOTIFICATION,
+            b"\xf5" if delivery_notification else b"\xf4",
+            _CBOR_LIFETIME,
+            _cbor_head(0x00, lifetime),
+            _CBOR_DATA,
+            _cbor_head(0x40, data.nbytes if type(data) is memoryview else len(data)),
+            data,
+        )
+    )
+
+
+def _bundle_to_json(
+    src: Any, dst: Any, delivery_notification: Any, lifetime: Any, data: Any
+) -> bytes:
+    """
+    Encodes the bundle object sent in JSON mode, with the payload in base64
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        raise TypeError(f"Argument data must be of type 'bytes', not '{type(data).__name__}'")
+    bundle_dict: dict = {
+        "src": src,
+        "dst": dst,
+        "delivery_notification": delivery_notification,
+        "lifetime": lifetime,
+    }
+    # encode in base64 and translate to str equivalent according to spec:
+    # https://github.com/dtn7/dtn7-rs/blob/9b166/doc/http-client-api.md
+    encoded_data: bytes = b64encode(data)
+    # base64 is plain ASCII, so it is spliced in as the last member of the JSON object
+    # instead of being decoded to str and scanned again by the JSON encoder
+    return b"".join((_json_dumps(bundle_dict)[:-1], b',"data":"', encoded_data, b'"}'))
 
 
 def _has_valid_schema(host: str):
-    return host.startswith("wss://") or host.startswith("ws://")
+    return host.startswith(("wss://", "ws://"))
+
+
+# corking holds back partial TCP segments until uncorked, only available on Linux
+_TCP_CORK: Optional[int] = getattr(socket, "TCP_CORK", None)
 
 
 def _rq_get(url: str) -> Any:
@@ -23,6 +121,13 @@ class WSMode(Enum):
     JSON_MODE = 1
 
 
+# bundle encoder of each mode, looked up on mode changes instead of on every send
+_BUNDLE_ENCODERS = {
+    WSMode.DATA_MODE: _bundle_to_cbor,
+    WSMode.JSON_MODE: _bundle_to_json,
+}
+
+
 class DTNWSClient:
     """WebSocket Client connecting to a running dtnd instance"""
 
@@ -49,6 +154,7 @@ class DTNWSClient:
     _callback: Union[Callable[[Bundle], Any], Callable[[str], Any]]
     _ws_base_url: str
     _endpoints: List[str]
+    _subscribe_cmds: List[bytes]
     _mode: WSMode
     _ws: WebSocketApp
 
@@ -59,12 +165,14 @@ class DTNWSClient:
         port: Optional[str] = None,
         ws_base_url: Optional[str] = None,
         endpoints: Optional[Iterable[str]] = None,
+        node_id: Optional[str] = None,
     ):
         """
 
         :param callback: method to call when data is received
         :param host: host of DTN7 daemon
         :param port: port of DTN7 daemon
+        :param node_id: node ID of the DTN7 daemon, if known, saves a connection to query it
         """
         if port is None:
             port = 3000
@@ -76,9 +184,7 @@ class DTNWSClient:
             endpoints = []
 
         if _has_valid_schema(host):
-            if host.endswith("/"):
-                host = host[:-1]
-            self._host = host
+            self._host = host.rstrip("/")
         else:
             raise ValueError("Host attribute must start either with 'ws://' or 'wss://'")
 
@@ -86,9 +192,15 @@ class DTNWSClient:
         self._port = port
         self._running = False
         self._ws_base_url = ws_base_url
-        self._endpoints = endpoints
+        # a list of its own, as endpoints may be a one-shot iterator
+        self._endpoints = list(endpoints)
+        # subscription commands are sent on every (re)connect, so they are only built once
+        self._subscribe_cmds: List[bytes] = [
+            f"{self._SUBSCRIBE_ENDPOINT} {eid}".encode() for eid in self._endpoints
+        ]
         self._mode = WSMode.DATA_MODE
-        self._node_id = self._get_node_id()
+        self._encode_payload: Callable[..., bytes] = _BUNDLE_ENCODERS[self._mode]
+        self._node_id = self._get_node_id() if node_id is None else node_id
         self._ws: WebSocketApp = WebSocketApp(
             f"{self._host}:{self._port}{self._ws_base_url}",
             on_open=self._on_open,
@@ -125,6 +237,7 @@ class DTNWSClient:
         elif val == WSMode.JSON_MODE and self._mode != WSMode.JSON_MODE:
             self._ws.send(data=self._JSON_MODE)
         self._mode = val
+        self._encode_payload = _BUNDLE_ENCODERS[val]
 
     def send_data(
         self,
@@ -134,38 +247,51 @@ class DTNWSClient:
         delivery_notification: bool = False,
         lifetime: int = 24 * 3600 * 1000,
     ):
+        payload: bytes = self._encode_bundle(
+            destination, data, source, delivery_notification, lifetime
+        )
+        self._ws.send(payload, opcode=ABNF.OPCODE_BINARY)
+
+    def send_data_batch(self, bundles: Iterable[dict]) -> None:
+        """
+        Sends several bundles in a row. All bundles are encoded before the first one is sent and
+        on Linux the socket is corked meanwhile, so the frames of small bundles share TCP segments.
+        :param bundles: keyword arguments of send_data() for each bundle
+        """
+        encode_bundle = self._encode_bundle
+        payloads: List[bytes] = [encode_bundle(**kwargs) for kwargs in bundles]
+        ws: Optional[WebSocket] = self._ws.sock
+        sock: Optional[socket.socket] = None if ws is None else ws.sock
+        if _TCP_CORK is not None and sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, _TCP_CORK, 1)
+        send = self._ws.send
+        opcode: int = ABNF.OPCODE_BINARY
+        try:
+            for payload in payloads:
+                send(payload, opcode=opcode)
+        finally:
+            if _TCP_CORK is not None and sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, _TCP_CORK, 0)
+
+    def _encode_bundle(
+        self,
+        destination: str,
+        data: bytes,
+        source: Optional[str] = None,
+        delivery_notification: bool = False,
+        lifetime: int = 24 * 3600 * 1000,
+    ) -> bytes:
         if source is None:
             source = self._node_id
-
-        bundle_dict: dict = {
-            "src": source,
-            "dst": destination,
-            "delivery_notification": delivery_notification,
-            "lifetime": lifetime,
-            "data": data,
-        }
-
-        payload: bytes
-        if self._mode == WSMode.DATA_MODE:
-            payload = cbor.dumps(bundle_dict)
-        else:
-            try:
-                # encode in base64 and translate to str equivalent according to spec:
-                # https://github.com/dtn7/dtn7-rs/blob/9b166/doc/http-client-api.md
-                bundle_dict["data"] = b64encode(bundle_dict["data"]).decode("utf-8")
-            except TypeError as e:
-                raise TypeError(f"Argument data must be of type 'bytes': {e}")
-            json_str = json.dumps(bundle_dict)
-            payload = json_str.encode()
-        self._ws.send(payload, opcode=ABNF.OPCODE_BINARY)
+        return self._encode_payload(source, destination, delivery_notification, lifetime, data)
 
     def subscribe(self, endpoint: str):
         self._ws.send(data=f"{self._SUBSCRIBE_ENDPOINT} {endpoint}")
 
     def _on_open(self, ws: WebSocketApp) -> None:
         self._ws.send(data=self._DATA_MODE)
-        for eid in self._endpoints:
-            ws.send(data=f"{self._SUBSCRIBE_ENDPOINT} {eid}")
+        for cmd in self._subscribe_cmds:
+            ws.send(data=cmd)
         self._running = True
 
     def _on_message(self, ws: WebSocketApp, msg: Any) -> None:
@@ -175,12 +301,12 @@ class DTNWSClient:
         self._callback(msg)
 
     def _on_error(self, ws: WebSocketApp, error) -> None:
-        print(f"{error}")
+        _logger.error("%s", error)
 
     def _on_close(self, ws: WebSocketApp, status_code, msg) -> None:
         # print(f"{status_code}, {msg}")
         self._running = False
-        print("Connection closed")
+        _logger.info("Connection closed")
 
     def _get_node_id(self) -> str:
         short_ws: WebSocket = WebSocket()
@@ -1,6 +1,8 @@
 import sys
 
 from datetime import datetime, timedelta, timezone
+from struct import pack
+from typing import Optional
 
 REF_DT = datetime(year=2000, month=1, day=1, hour=0, minute=0, second=0, tzinfo=timezone.utc)
 """
@@ -21,13 +23,33 @@ def from_dtn_timestamp(timestamp: int) -> datetime:
     return REF_DT + timedelta(milliseconds=timestamp)
 
 
-def to_dtn_timestamp(dt: datetime = None) -> int:
+def to_dtn_timestamp(dt: Optional[datetime] = None) -> int:
+    """
+    Converts a Python datetime object into a DTN timestamp
+    :param dt: the datetime to convert, defaults to the current time
+    :return: the DTN timestamp of the datetime
+    """
     if dt is None:
         dt = datetime.now(timezone.utc)
 
+    delta: timedelta = dt - REF_DT
+    # integer arithmetic stays exact where a float of total_seconds() would lose precision,
+    # cutoff beyond milliseconds, no rounding here
+    return delta.days * 86400000 + delta.seconds * 1000 + delta.microseconds // 1000
+
+
+def _cbor_head(major_type: int, argument: int) -> bytes:
     """
-    Converts a Python datetime object into a DTN timestamp
-    :param dt:
-    :return:
+    Encodes the head of a CBOR data item in its shortest form
+    :param major_type: major type shifted into the upper three bits, e.g. 0x60 for text strings
+    :param argument: the value or length the head carries, must be below 2**64
     """
-    return int((dt - REF_DT).total_seconds() * 1000)  # cutoff beyond milliseconds, no rounding here
+    if argument < 24:
+        return bytes((major_type | argument,))
+    if argument < 0x100:
+        return bytes((major_type | 24, argument))
+    if argument < 0x10000:
+        return pack(">BH", major_type | 25, argument)
+    if argument < 0x100000000:
+        return pack(">BI", major_type | 26, argument)
+    return pack(">BQ", major_type | 27, argument)
@@ -0,0 +1,15 @@
+from pathlib import Path
+
+import pytest
+
+try:
+    from tomllib import loads as toml_loads
+except ImportError:  # Python < 3.11
+    from toml import loads as toml_loads
+
+
+@pytest.fixture(scope="session")
+def pyproject_version() -> str:
+    """Version from pyproject.toml, parsed once per test session."""
+    path = Path(__file__).resolve().parents[1] / "pyproject.toml"
+    return toml_loads(path.read_text())["tool"]["poetry"]["version"]
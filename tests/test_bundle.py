@@ -1,8 +1,31 @@
+from contextlib import redirect_stdout
 from copy import deepcopy
-import mock
-from unittest import TestCase
-
-from py_dtn7.bundle import *
+from enum import Enum
+from io import BytesIO, StringIO
+from random import Random
+from unittest import TestCase, mock
+
+import pytest
+from cbor2 import dumps, loads
+
+from py_dtn7 import from_dtn_timestamp
+from py_dtn7.bundle import (
+    CRC_TYPE_NOCRC,
+    URI_SCHEME_DTN_ENCODED,
+    URI_SCHEME_DTN_NAME,
+    URI_SCHEME_IPN_ENCODED,
+    BlockProcessingControlFlags,
+    Bundle,
+    BundleAgeBlock,
+    BundleProcessingControlFlags,
+    CanonicalBlock,
+    Flags,
+    HopCountBlock,
+    PayloadBlock,
+    PreviousNodeBlock,
+    PrimaryBlock,
+    _dtn_node_id_to_cbor,
+)
 
 BUNDLE_CREATION_TIME: int = (3600 * 24 * 31 + 3600 * 9) * 1000  # 2000-01-31 09:00:00 +0000 (UTC)
 BUNDLE_LIFETIME: int = 1337 * 1000  # 1337 seconds
@@ -11,348 +34,525 @@ DESTINATION_SPECIFIC_PART: str = "//node1/incoming"
 SEQ_NUMBER = 99
 SOURCE_SPECIFIC_PART: str = "//uav1/sink"
 REPORT_TO_SPECIFIC_PART: str = "//statistics/messages"
+ALL_BITS_128: int = (1 << 128) - 1
+EXPECTED_BUNDLE_ID: str = f"{URI_SCHEME_DTN_NAME}:{SOURCE_SPECIFIC_PART}-0-{SEQ_NUMBER}"
+EXPECTED_CREATION_DT = from_dtn_timestamp(BUNDLE_CREATION_TIME)
+BUNDLE_PROCESSING_CONTROL_FLAG_NAMES = (
+    "is_fragment",
+    "payload_is_admin_record",
+    "do_not_fragment",
+    "acknowledgement_is_requested",
+    "status_time_is_requested",
+    "status_of_report_reception_is_requested",
+    "status_of_report_forwarding_is_requested",
+    "status_of_report_delivery_is_requested",
+    "status_of_report_deletion_is_requested",
+)
+BLOCK_PROCESSING_CONTROL_FLAG_NAMES = (
+    "block_must_be_replicated",
+    "report_status_if_block_cant_be_processed",
+    "delete_bundle_if_block_cant_be_processed",
+    "discard_block_if_block_cant_be_processed",
+)
+# CBOR encoded block payloads shared by the canonical block and bundle tests
+CBOR_DTN_NODE_ID = dumps(PrimaryBlock.from_full_uri("dtn://node1/incoming"))
+CBOR_IPN_NODE_ID = dumps(PrimaryBlock.from_full_uri("ipn://1234.5678"))
+CBOR_AGE = dumps(1234567)
+CBOR_HOP_COUNT = dumps((98, 76))
+# block data of any length below 1000 is sliced from this
+ZEROS = (0,) * 999
+# read-only template, tests that change a primary block work on a copy_of() it
+PRIMARY_BLOCK = PrimaryBlock(
+    version=7,
+    bundle_processing_control_flags=BundleProcessingControlFlags(flags=CONTROL_FLAGS),
+    crc_type=CRC_TYPE_NOCRC,
+    destination_scheme=URI_SCHEME_DTN_ENCODED,
+    destination_specific_part=DESTINATION_SPECIFIC_PART,
+    source_scheme=URI_SCHEME_DTN_ENCODED,
+    source_specific_part=SOURCE_SPECIFIC_PART,
+    report_to_scheme=URI_SCHEME_DTN_ENCODED,
+    report_to_specific_part=REPORT_TO_SPECIFIC_PART,
+    bundle_creation_time=BUNDLE_CREATION_TIME,
+    sequence_number=SEQ_NUMBER,
+    lifetime=BUNDLE_LIFETIME,
+)
+# full URIs and their encoded (scheme, specific part) pairs, valid in both directions
+VALID_URIS = (
+    ("dtn://hahaha/~what", (1, "//hahaha/~what")),
+    ("dtn://none", (1, 0)),
+    ("ipn://none", (2, 0)),
+    ("ipn://1234.5678", (2, (1234, 5678))),
+)
+INVALID_URIS = (
+    "",
+    "://",
+    "://wait/~what",
+    "badscheme://hahah/~what",
+    "ipn://",
+    "ipn://1",
+    "ipn://1.2.3",
+    "ipn://-1.2",
+    "ipn://-1.-2",
+    "ipn://1.-2",
+)
+INVALID_IPN_SPECIFIC_PARTS = ([], [1], [1, 2, 3], [-1, 2], [-1, -2], [1, -2])
+# only 1 and 2 are valid: values around them, far off and a few fixed random samples in between
+INVALID_URI_SCHEMES = (-1000, -1, 0, 3, 4, 1 << 16, 99999) + tuple(
+    Random(0).sample(range(5, 99999), 8)
+)
+
+
+def copy_of(item):
+    """
+    Builds an equal but independent copy of a flags object, block or bundle from its plain data,
+    which is much cheaper than a generic deepcopy()
+    """
+    if isinstance(item, (Flags, PrimaryBlock)):
+        return deepcopy(item)
+    if isinstance(item, CanonicalBlock):
+        return CanonicalBlock.from_block_data(list(item.to_block_data()))
+    blocks = (
+        item.previous_node_block,
+        item.bundle_age_block,
+        item.hop_count_block,
+        item.payload_block,
+    )
+    return Bundle(
+        copy_of(item.primary_block),
+        *(None if block is None else copy_of(block) for block in blocks),
+        [copy_of(block) for block in item.other_blocks],
+    )
+
+
+@pytest.fixture(scope="module")
+def f_all_true():
+    return Flags(ALL_BITS_128)
+
+
+@pytest.fixture(scope="module")
+def f_all_false():
+    return Flags(0)
+
+
+@pytest.fixture
+def primary_block():
+    return copy_of(PRIMARY_BLOCK)
+
+
+# Flags ###########################################################################################
+
+
+def test_get_all_false_flags(f_all_false):
+    assert f_all_false.flags & ALL_BITS_128 == 0
+    assert f_all_false.none_set()
+
+
+def test_get_all_true_flags(f_all_true):
+    assert f_all_true.flags & ALL_BITS_128 == ALL_BITS_128
+    assert f_all_true.all_set(128)
+    assert not f_all_true.all_set(129)
+    assert not f_all_true.none_set()
+    assert not f_all_true.get_flag(128)
+
+
+@pytest.mark.parametrize("bit", (0, 1, 63, 64, 127))
+def test_get_flag(bit):
+    assert Flags(ALL_BITS_128).get_flag(bit)
+    assert Flags(1 << bit).get_flag(bit)
+    assert not Flags(0).get_flag(bit)
+    assert not Flags(ALL_BITS_128 ^ (1 << bit)).get_flag(bit)
+
+
+@pytest.mark.parametrize("flags", (Flags(0), "1", 3.14159265))
+def test_flags_invalid_argument(flags):
+    with pytest.raises(TypeError):
+        Flags(flags)
+
 
+def test_set_all_flags(f_all_true):
+    f = Flags(0)
+    f.set_all(128)
+    assert f.flags == f_all_true.flags
 
-class TestFlags(TestCase):
-    def setUp(self):
-        self.f_all_true = Flags(0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
-        self.f_all_false = Flags(0)
 
-    def test_get_all_false_flags(self):
-        self.assertFalse(any([self.f_all_false.get_flag(bit) for bit in range(128)]))
+def test_unset_all_flags(f_all_false):
+    f = Flags(ALL_BITS_128)
+    f.unset_all()
+    assert f.flags == f_all_false.flags
 
-    def test_get_all_true_flags(self):
-        self.assertTrue(all([self.f_all_true.get_flag(bit) for bit in range(128)]))
 
-    def test_invalid_argument(self):
-        self.assertRaises(TypeError, Flags, Flags(0))
-        self.assertRaises(TypeError, Flags, "1")
-        self.assertRaises(TypeError, Flags, 3.14159265)
+def test_set_and_unset_mask(f_all_true, f_all_false):
+    f = Flags(0)
+    f.set_mask(ALL_BITS_128)
+    assert f == f_all_true
+    f.unset_mask(CONTROL_FLAGS)
+    assert f.flags == ALL_BITS_128 ^ CONTROL_FLAGS
+    f.unset_mask(ALL_BITS_128)
+    assert f == f_all_false
 
-    def test_set_all_flags(self):
-        f = deepcopy(self.f_all_false)
-        for bit in range(128):
-            f.set_flag(bit)
-        self.assertEqual(f.flags, self.f_all_true.flags)
 
-    def test_unset_all_flags(self):
-        f = deepcopy(self.f_all_true)
-        for bit in range(128):
-            f.unset_flag(bit)
-        self.assertEqual(f.flags, self.f_all_false.flags)
+@pytest.mark.parametrize("bit", (0, 1, 63, 64, 127))
+def test_set_flag_individual_bits(bit):
+    f = Flags(0)
+    f.set_flag(bit)
+    assert f.flags == 1 << bit
+    assert f.get_flag(bit)
+    f.unset_flag(bit)
+    assert f.flags == 0
 
-    def test_eq_true_same_type(self):
-        f = deepcopy(self.f_all_true)
-        self.assertTrue(self.f_all_true == f)
 
-    def test_eq_false_same_type(self):
-        f = deepcopy(self.f_all_false)
-        self.assertTrue(f == self.f_all_false)
-        f.set_flag(5)
-        self.assertFalse(f == self.f_all_false)
-        self.assertFalse(f == self.f_all_true)
+def test_flags_eq_true_same_type(f_all_true):
+    assert f_all_true == Flags(ALL_BITS_128)
 
-    def test_eq_wrong_type(self):
-        self.assertEqual(self.f_all_false.__eq__(0), NotImplemented)
 
-    def test_repr(self):
-        self.assertEqual(repr(self.f_all_false), "0x0")
-        self.assertEqual(repr(self.f_all_true), "0xffffffffffffffffffffffffffffffff")
+def test_flags_eq_false_same_type(f_all_true, f_all_false):
+    f = Flags(0)
+    assert f == f_all_false
+    f.set_flag(5)
+    assert not f == f_all_false
+    assert not f == f_all_true
 
 
-class TestBundleProcessingControlFlags(TestCase):
-    def setUp(self):
-        # 0x7FFFF sets bits 18..0 to true
-        self.f_all_true = BundleProcessingControlFlags(flags=0x7FFFF)
-        self.f_all_false = BundleProcessingControlFlags(flags=0)
-
-    def test_false_control_flags(self):
-        self.assertFalse(
-            any(
-                [
-                    self.f_all_false.is_fragment,
-                    self.f_all_false.payload_is_admin_record,
-                    self.f_all_false.do_not_fragment,
-                    self.f_all_false.acknowledgement_is_requested,
-                    self.f_all_false.status_time_is_requested,
-                    self.f_all_false.status_of_report_reception_is_requested,
-                    self.f_all_false.status_of_report_forwarding_is_requested,
-                    self.f_all_false.status_of_report_delivery_is_requested,
-                    self.f_all_false.status_of_report_deletion_is_requested,
-                ]
-            )
-        )
+def test_flags_eq_wrong_type(f_all_false):
+    assert f_all_false.__eq__(0) is NotImplemented
 
-    def test_true_control_flags(self):
-        self.assertTrue(
-            all(
-                [
-                    self.f_all_true.is_fragment,
-                    self.f_all_true.payload_is_admin_record,
-                    self.f_all_true.do_not_fragment,
-                    self.f_all_true.acknowledgement_is_requested,
-                    self.f_all_true.status_time_is_requested,
-                    self.f_all_true.status_of_report_reception_is_requested,
-                    self.f_all_true.status_of_report_forwarding_is_requested,
-                    self.f_all_true.status_of_report_delivery_is_requested,
-                    self.f_all_true.status_of_report_deletion_is_requested,
-                ]
-            )
-        )
 
+def test_flags_deepcopy():
+    f = BundleProcessingControlFlags(CONTROL_FLAGS)
+    f_copy = deepcopy(f)
+    assert type(f_copy) is BundleProcessingControlFlags
+    assert f_copy == f
+    f_copy.set_flag(0)
+    assert f.flags == CONTROL_FLAGS
 
-class TestBlockProcessingControlFlags(TestCase):
-    def setUp(self):
-        # 0x1F sets bits 4..0 to true
-        self.f_all_true = BlockProcessingControlFlags(flags=0x1F)
-        self.f_all_false = BlockProcessingControlFlags(flags=0)
-
-    def test_false_control_flags(self):
-        self.assertFalse(
-            any(
-                [
-                    self.f_all_false.block_must_be_replicated,
-                    self.f_all_false.report_status_if_block_cant_be_processed,
-                    self.f_all_false.delete_bundle_if_block_cant_be_processed,
-                    self.f_all_false.discard_block_if_block_cant_be_processed,
-                ]
-            )
-        )
 
-    def test_true_control_flags(self):
-        self.assertTrue(
-            all(
-                [
-                    self.f_all_true.block_must_be_replicated,
-                    self.f_all_true.report_status_if_block_cant_be_processed,
-                    self.f_all_true.delete_bundle_if_block_cant_be_processed,
-                    self.f_all_true.discard_block_if_block_cant_be_processed,
-                ]
-            )
-        )
+def test_flags_repr(f_all_true, f_all_false):
+    assert repr(f_all_false) == "0x0"
+    assert repr(f_all_true) == "0xffffffffffffffffffffffffffffffff"
 
 
-class TestPrimaryBlock(TestCase):
-    def setUp(self):
-        self.primary_block = PrimaryBlock(
-            version=7,
-            bundle_processing_control_flags=BundleProcessingControlFlags(flags=CONTROL_FLAGS),
-            crc_type=CRC_TYPE_NOCRC,
-            destination_scheme=URI_SCHEME_DTN_ENCODED,
-            destination_specific_part=DESTINATION_SPECIFIC_PART,
-            source_scheme=URI_SCHEME_DTN_ENCODED,
-            source_specific_part=SOURCE_SPECIFIC_PART,
-            report_to_scheme=URI_SCHEME_DTN_ENCODED,
-            report_to_specific_part=REPORT_TO_SPECIFIC_PART,
-            bundle_creation_time=BUNDLE_CREATION_TIME,
-            sequence_number=SEQ_NUMBER,
-            lifetime=BUNDLE_LIFETIME,
-        )
+def test_flags_str_lists_properties_of_any_subclass():
+    class MyFlags(Flags):
+        __slots__ = ()
 
-    # Tests for static methods:
+        @property
+        def foo(self) -> bool:
+            return self.get_flag(0)
 
-    def test_from_objects(self):
-        pb_ut = PrimaryBlock.from_objects(
-            full_destination_uri=f"dtn:{DESTINATION_SPECIFIC_PART}",
-            full_source_uri=f"dtn:{SOURCE_SPECIFIC_PART}",
-            full_report_to_uri=f"dtn:{REPORT_TO_SPECIFIC_PART}",
-            bundle_processing_control_flags=BundleProcessingControlFlags(flags=CONTROL_FLAGS),
-            bundle_creation_time=BUNDLE_CREATION_TIME,
-            sequence_number=SEQ_NUMBER,
-            lifetime=BUNDLE_LIFETIME,
-        )
-        self.assertEqual(self.primary_block, pb_ut)
-
-    def test_primary_block_from_block_data(self):
-        pb_ut = PrimaryBlock.from_block_data(
-            (
-                7,
-                CONTROL_FLAGS,
-                CRC_TYPE_NOCRC,
-                (URI_SCHEME_DTN_ENCODED, DESTINATION_SPECIFIC_PART),
-                (URI_SCHEME_DTN_ENCODED, SOURCE_SPECIFIC_PART),
-                (URI_SCHEME_DTN_ENCODED, REPORT_TO_SPECIFIC_PART),
-                (BUNDLE_CREATION_TIME, SEQ_NUMBER),
-                BUNDLE_LIFETIME,
-            )
-        )
-        self.assertEqual(pb_ut, self.primary_block)
+    class MoreFlags(MyFlags):
+        __slots__ = ()
 
-    def test_version_is_7_check(self):
-        pb_ut = (
-            1337,
-            CONTROL_FLAGS,
-            CRC_TYPE_NOCRC,
-            (URI_SCHEME_DTN_ENCODED, DESTINATION_SPECIFIC_PART),
-            (URI_SCHEME_DTN_ENCODED, SOURCE_SPECIFIC_PART),
-            (URI_SCHEME_DTN_ENCODED, REPORT_TO_SPECIFIC_PART),
-            (BUNDLE_CREATION_TIME, SEQ_NUMBER),
-            BUNDLE_LIFETIME,
-        )
-        self.assertRaises(NotImplementedError, PrimaryBlock.from_block_data, pb_ut)
+        @property
+        def bar(self) -> bool:
+            return self.get_flag(1)
 
-    def test_invalid_length_of_block_data(self):
-        # better safe than sorry:
-        lengths = list(range(8)) + list(range(12, 65))
-        for ell in lengths:
-            self.assertRaises(ValueError, PrimaryBlock.from_block_data, [0 for _ in range(ell)])
+    assert str(MyFlags(1)) == "<MyFlags: [foo: True]>"
+    assert str(MoreFlags(2)) == "<MoreFlags: [bar: True, foo: False]>"
+    assert str(MyFlags(0)) == "<MyFlags: [foo: False]>"
+    assert str(BlockProcessingControlFlags(0)).startswith("<BlockProcessingControlFlags: [")
 
-    def test_crc_and_fragments_not_implemented_error(self):
-        # CRC and fragments are not supported yet, so block data with certain lengths are refused with an error
-        lengths = [9, 10, 11]
-        for ell in lengths:
-            self.assertRaises(
-                NotImplementedError, PrimaryBlock.from_block_data, [0 for _ in range(ell)]
-            )
 
-    def test_invalid_bundle_data(self):
-        pb = (
+@pytest.mark.parametrize("name", BUNDLE_PROCESSING_CONTROL_FLAG_NAMES)
+def test_bundle_processing_control_flags(name):
+    # 0x7FFFF sets bits 18..0 to true
+    assert getattr(BundleProcessingControlFlags(flags=0x7FFFF), name)
+    assert not getattr(BundleProcessingControlFlags(flags=0), name)
+
+
+@pytest.mark.parametrize("name", BLOCK_PROCESSING_CONTROL_FLAG_NAMES)
+def test_block_processing_control_flags(name):
+    # 0x1F sets bits 4..0 to true
+    assert getattr(BlockProcessingControlFlags(flags=0x1F), name)
+    assert not getattr(BlockProcessingControlFlags(flags=0), name)
+
+
+# PrimaryBlock static methods #####################################################################
+
+
+def test_primary_block_from_objects(primary_block):
+    pb_ut = PrimaryBlock.from_objects(
+        full_destination_uri=f"dtn:{DESTINATION_SPECIFIC_PART}",
+        full_source_uri=f"dtn:{SOURCE_SPECIFIC_PART}",
+        full_report_to_uri=f"dtn:{REPORT_TO_SPECIFIC_PART}",
+        bundle_processing_control_flags=BundleProcessingControlFlags(flags=CONTROL_FLAGS),
+        bundle_creation_time=BUNDLE_CREATION_TIME,
+        sequence_number=SEQ_NUMBER,
+        lifetime=BUNDLE_LIFETIME,
+    )
+    assert primary_block == pb_ut
+
+
+def test_primary_block_from_block_data(primary_block):
+    pb_ut = PrimaryBlock.from_block_data(
+        (
             7,
             CONTROL_FLAGS,
             CRC_TYPE_NOCRC,
-            [URI_SCHEME_DTN_ENCODED],  # indexing into block data will fail here
+            (URI_SCHEME_DTN_ENCODED, DESTINATION_SPECIFIC_PART),
             (URI_SCHEME_DTN_ENCODED, SOURCE_SPECIFIC_PART),
             (URI_SCHEME_DTN_ENCODED, REPORT_TO_SPECIFIC_PART),
             (BUNDLE_CREATION_TIME, SEQ_NUMBER),
             BUNDLE_LIFETIME,
         )
-        self.assertRaises(ValueError, PrimaryBlock.from_block_data, pb)
-
-    def test_check_invalid_uri_schemes(self):
-        # must raise a ValueError since:
-        # " ... function receives an argument that has the right type but an inappropriate value"
-        # https://docs.python.org/3/library/exceptions.html#ValueError
-        invalid_schemes = list(range(-1000, 1)) + list(range(3, 100000))
-        for scheme in invalid_schemes:
-            self.assertRaises(ValueError, PrimaryBlock.check_uri_scheme, scheme)
-
-    def test_check_valid_uri_schemes(self):
-        self.assertIsNone(PrimaryBlock.check_uri_scheme(1))
-        self.assertIsNone(PrimaryBlock.check_uri_scheme(2))
-
-    def test_from_full_uri_valid_uri(self):
-        self.assertEqual(PrimaryBlock.from_full_uri("dtn://hahaha/~what"), (1, "//hahaha/~what"))
-        self.assertEqual(PrimaryBlock.from_full_uri("dtn://none"), (1, 0))
-        self.assertEqual(PrimaryBlock.from_full_uri("ipn://none"), (2, 0))
-        self.assertEqual(PrimaryBlock.from_full_uri("ipn://1234.5678"), (2, (1234, 5678)))
-
-    def test_from_full_uri_invalid_scheme_name(self):
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "://")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "://wait/~what")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "badscheme://hahah/~what")
-
-    def test_from_full_uri_invalid_endpoint(self):
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "ipn://")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "ipn://1")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "ipn://1.2.3")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "ipn://-1.2")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "ipn://-1.-2")
-        self.assertRaises(ValueError, PrimaryBlock.from_full_uri, "ipn://1.-2")
-
-    def test_to_full_uri_valid_input(self):
-        self.assertEqual(PrimaryBlock.to_full_uri(1, "//hahaha/~what"), "dtn://hahaha/~what")
-        self.assertEqual(PrimaryBlock.to_full_uri(1, 0), "dtn://none")
-        self.assertEqual(PrimaryBlock.to_full_uri(2, 0), "ipn://none")
-        self.assertEqual(PrimaryBlock.to_full_uri(2, [1234, 5678]), "ipn://1234.5678")
-
-    def test_to_full_uri_invalid_endpoint(self):
-        self.assertRaises(ValueError, PrimaryBlock.to_full_uri, 2, [])
-        self.assertRaises(ValueError, PrimaryBlock.to_full_uri, 2, [1])
-        self.assertRaises(ValueError, PrimaryBlock.to_full_uri, 2, [1, 2, 3])
-        self.assertRaises(ValueError, PrimaryBlock.to_full_uri, 2, [-1, 2])
-        self.assertRaises(ValueError, PrimaryBlock.to_full_uri, 2, [-1, -2])
-        self.assertRaises(ValueError, PrimaryBlock.to_full_uri, 2, [1, -2])
-        self.assertRaises(TypeError, PrimaryBlock.to_full_uri, 2, ["1", "2"])
-        self.assertRaises(TypeError, PrimaryBlock.to_full_uri, 2, ["one", "two"])
-
-    def test_to_full_uri_invalid_scheme_code(self):
-        invalid_schemes = list(range(-1000, 1)) + list(range(3, 100000))
-        for scheme in invalid_schemes:
-            self.assertRaises(ValueError, PrimaryBlock.to_full_uri, scheme, 0)
-
-    # Tests for instance methods ##################################################################
+    )
+    assert pb_ut == primary_block
 
-    def test_eq_operator(self):
-        pb = deepcopy(self.primary_block)
-        self.assertEqual(pb, self.primary_block)
 
-    def test_primary_block_to_block_data(self):
-        pb_ut = (
+def test_version_is_7_check():
+    pb_ut = (
+        1337,
+        CONTROL_FLAGS,
+        CRC_TYPE_NOCRC,
+        (URI_SCHEME_DTN_ENCODED, DESTINATION_SPECIFIC_PART),
+        (URI_SCHEME_DTN_ENCODED, SOURCE_SPECIFIC_PART),
+        (URI_SCHEME_DTN_ENCODED, REPORT_TO_SPECIFIC_PART),
+        (BUNDLE_CREATION_TIME, SEQ_NUMBER),
+        BUNDLE_LIFETIME,
+    )
+    with pytest.raises(NotImplementedError):
+        PrimaryBlock.from_block_data(pb_ut)
+
+
+def test_dtn_specific_parts_are_interned(primary_block):
+    pb = PrimaryBlock.from_block_data(
+        (
             7,
             CONTROL_FLAGS,
             CRC_TYPE_NOCRC,
-            (URI_SCHEME_DTN_ENCODED, DESTINATION_SPECIFIC_PART),
-            (URI_SCHEME_DTN_ENCODED, SOURCE_SPECIFIC_PART),
-            (URI_SCHEME_DTN_ENCODED, REPORT_TO_SPECIFIC_PART),
+            (URI_SCHEME_DTN_ENCODED, "".join(DESTINATION_SPECIFIC_PART)),
+            (URI_SCHEME_DTN_ENCODED, "".join(SOURCE_SPECIFIC_PART)),
+            (URI_SCHEME_DTN_ENCODED, "".join(REPORT_TO_SPECIFIC_PART)),
             (BUNDLE_CREATION_TIME, SEQ_NUMBER),
             BUNDLE_LIFETIME,
         )
-        self.assertEqual(pb_ut, self.primary_block.to_block_data())
+    )
+    assert pb.destination_specific_part is primary_block.destination_specific_part
+    assert pb.source_specific_part is primary_block.source_specific_part
+    assert pb.report_to_specific_part is primary_block.report_to_specific_part
 
-    def test_bundle_creation_time_datetime(self):
-        # check if we're calling the correct function. Correctness of that function is tested in its own unit test
-        self.assertEqual(
-            self.primary_block.bundle_creation_time_datetime,
-            from_dtn_timestamp(BUNDLE_CREATION_TIME),
+
+def test_str_subclass_specific_parts_are_kept():
+    class Node(str, Enum):
+        DESTINATION = DESTINATION_SPECIFIC_PART
+
+    pb = PrimaryBlock(
+        version=7,
+        bundle_processing_control_flags=BundleProcessingControlFlags(flags=CONTROL_FLAGS),
+        crc_type=CRC_TYPE_NOCRC,
+        destination_scheme=URI_SCHEME_DTN_ENCODED,
+        destination_specific_part=Node.DESTINATION,
+        source_scheme=URI_SCHEME_DTN_ENCODED,
+        source_specific_part=SOURCE_SPECIFIC_PART,
+        report_to_scheme=URI_SCHEME_DTN_ENCODED,
+        report_to_specific_part=REPORT_TO_SPECIFIC_PART,
+        bundle_creation_time=BUNDLE_CREATION_TIME,
+        sequence_number=SEQ_NUMBER,
+        lifetime=BUNDLE_LIFETIME,
+    )
+    assert pb.destination_specific_part is Node.DESTINATION
+    assert pb == PRIMARY_BLOCK
+
+
+def test_invalid_bundle_data():
+    pb = (
+        7,
+        CONTROL_FLAGS,
+        CRC_TYPE_NOCRC,
+        [URI_SCHEME_DTN_ENCODED],  # indexing into block data will fail here
+        (URI_SCHEME_DTN_ENCODED, SOURCE_SPECIFIC_PART),
+        (URI_SCHEME_DTN_ENCODED, REPORT_TO_SPECIFIC_PART),
+        (BUNDLE_CREATION_TIME, SEQ_NUMBER),
+        BUNDLE_LIFETIME,
+    )
+    with pytest.raises(ValueError):
+        PrimaryBlock.from_block_data(pb)
+
+
+# boundaries of the refused lengths 0..7 and 12 and above
+@pytest.mark.parametrize("length", (0, 1, 7, 12, 13, 64))
+def test_invalid_length_of_primary_block_data(length):
+    with pytest.raises(ValueError):
+        PrimaryBlock.from_block_data(ZEROS[:length])
+
+
+# CRC and fragments are not supported yet, so block data with these lengths is refused with an error
+@pytest.mark.parametrize("length", (9, 10, 11))
+def test_crc_and_fragments_not_implemented_error(length):
+    with pytest.raises(NotImplementedError):
+        PrimaryBlock.from_block_data(ZEROS[:length])
+
+
+@pytest.mark.parametrize("scheme", INVALID_URI_SCHEMES)
+def test_check_invalid_uri_schemes(scheme):
+    # must raise a ValueError since:
+    # " ... function receives an argument that has the right type but an inappropriate value"
+    # https://docs.python.org/3/library/exceptions.html#ValueError
+    with pytest.raises(ValueError):
+        PrimaryBlock.check_uri_scheme(scheme)
+
+
+def test_check_valid_uri_schemes():
+    assert PrimaryBlock.check_uri_scheme(1) is None
+    assert PrimaryBlock.check_uri_scheme(2) is None
+
+
+@pytest.mark.parametrize("uri,expected", VALID_URIS)
+def test_from_full_uri_valid_uri(uri, expected):
+    assert PrimaryBlock.from_full_uri(uri) == expected
+
+
+@pytest.mark.parametrize("uri", INVALID_URIS)
+def test_from_full_uri_invalid_uri(uri):
+    with pytest.raises(ValueError):
+        PrimaryBlock.from_full_uri(uri)
+
+
+# ipn endpoint IDs decoded from CBOR are lists instead of tuples
+@pytest.mark.parametrize("uri,encoded", VALID_URIS + (("ipn://1234.5678", (2, [1234, 5678])),))
+def test_to_full_uri_valid_input(uri, encoded):
+    assert PrimaryBlock.to_full_uri(*encoded) == uri
+
+
+@pytest.mark.parametrize("specific_part", INVALID_IPN_SPECIFIC_PARTS)
+def test_to_full_uri_invalid_endpoint(specific_part):
+    with pytest.raises(ValueError):
+        PrimaryBlock.to_full_uri(URI_SCHEME_IPN_ENCODED, specific_part)
+
+
+@pytest.mark.parametrize("specific_part", (["1", "2"], ["one", "two"]))
+def test_to_full_uri_non_integer_endpoint(specific_part):
+    with pytest.raises(TypeError):
+        PrimaryBlock.to_full_uri(URI_SCHEME_IPN_ENCODED, specific_part)
+
+
+# lengths around each width of the text string head, in UTF-8 bytes
+@pytest.mark.parametrize("length", (0, 23, 24, 255, 256, 65535, 65536))
+@pytest.mark.parametrize("char", ("a", "ä"))
+def test_dtn_node_id_to_cbor(length, char):
+    specific_part = "//" + char * ((length - 2) // len(char.encode()))
+    assert _dtn_node_id_to_cbor(specific_part) == dumps((URI_SCHEME_DTN_ENCODED, specific_part))
+
+
+@pytest.mark.parametrize("scheme", INVALID_URI_SCHEMES)
+def test_to_full_uri_invalid_scheme_code(scheme):
+    with pytest.raises(ValueError):
+        PrimaryBlock.to_full_uri(scheme, 0)
+
+
+# PrimaryBlock instance methods ###################################################################
+
+
+def test_primary_block_eq_operator(primary_block):
+    assert copy_of(primary_block) == primary_block
+    assert primary_block.__eq__(0) is NotImplemented
+
+
+def test_primary_block_deepcopy(primary_block):
+    # ipn endpoint IDs decoded from CBOR are mutable lists
+    primary_block.report_to_scheme = URI_SCHEME_IPN_ENCODED
+    primary_block.report_to_specific_part = [12, 34]
+    pb = deepcopy(primary_block)
+    assert pb == primary_block
+    pb.bundle_processing_control_flags.set_flag(0)
+    pb.report_to_specific_part[0] = 56
+    assert primary_block.bundle_processing_control_flags.flags == CONTROL_FLAGS
+    assert primary_block.full_report_to_uri == "ipn://12.34"
+
+
+def test_primary_block_to_block_data(primary_block):
+    pb_ut = (
+        7,
+        CONTROL_FLAGS,
+        CRC_TYPE_NOCRC,
+        (URI_SCHEME_DTN_ENCODED, DESTINATION_SPECIFIC_PART),
+        (URI_SCHEME_DTN_ENCODED, SOURCE_SPECIFIC_PART),
+        (URI_SCHEME_DTN_ENCODED, REPORT_TO_SPECIFIC_PART),
+        (BUNDLE_CREATION_TIME, SEQ_NUMBER),
+        BUNDLE_LIFETIME,
+    )
+    assert pb_ut == primary_block.to_block_data()
+
+
+def test_bundle_creation_time_datetime(primary_block):
+    # check if we're calling the correct function, its correctness is tested in its own unit test
+    assert primary_block.bundle_creation_time_datetime == EXPECTED_CREATION_DT
+
+
+class TestPrimaryBlockFullUri(TestCase):
+    # to_full_uri and from_full_uri are patched once for the whole class with plain Mocks, the tests
+    # only look at the call arguments
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = mock.patch.multiple(
+            PrimaryBlock,
+            new_callable=mock.Mock,
+            to_full_uri=mock.DEFAULT,
+            from_full_uri=mock.DEFAULT,
         )
+        mocks = cls.patcher.start()
+        cls.mock_to_full_uri = mocks["to_full_uri"]
+        cls.mock_from_full_uri = mocks["from_full_uri"]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
+    def setUp(self):
+        self.mock_to_full_uri.reset_mock()
+        self.mock_from_full_uri.reset_mock()
+        self.primary_block = copy_of(PRIMARY_BLOCK)
 
-    @mock.patch.object(PrimaryBlock, "to_full_uri")
-    def test_full_source_uri(self, mock_to_full_uri):
+    def test_full_source_uri(self):
         self.primary_block.full_source_uri
-        self.assertTrue(mock_to_full_uri.called)
-        self.assertEqual(mock_to_full_uri.call_args[0][0], self.primary_block.source_scheme)
-        self.assertEqual(mock_to_full_uri.call_args[0][1], self.primary_block.source_specific_part)
+        self.mock_to_full_uri.assert_called_once_with(
+            self.primary_block.source_scheme, self.primary_block.source_specific_part
+        )
 
-    @mock.patch.object(PrimaryBlock, "to_full_uri")
-    def test_full_destination_uri(self, mock_to_full_uri):
+    def test_full_destination_uri(self):
         self.primary_block.full_destination_uri
-        self.assertTrue(mock_to_full_uri.called)
-        self.assertEqual(mock_to_full_uri.call_args[0][0], self.primary_block.destination_scheme)
-        self.assertEqual(
-            mock_to_full_uri.call_args[0][1], self.primary_block.destination_specific_part
+        self.mock_to_full_uri.assert_called_once_with(
+            self.primary_block.destination_scheme, self.primary_block.destination_specific_part
         )
 
-    @mock.patch.object(PrimaryBlock, "to_full_uri")
-    def test_full_report_to_uri(self, mock_to_full_uri):
+    def test_full_report_to_uri(self):
         self.primary_block.full_report_to_uri
-        self.assertTrue(mock_to_full_uri.called)
-        self.assertEqual(mock_to_full_uri.call_args[0][0], self.primary_block.report_to_scheme)
-        self.assertEqual(
-            mock_to_full_uri.call_args[0][1], self.primary_block.report_to_specific_part
+        self.mock_to_full_uri.assert_called_once_with(
+            self.primary_block.report_to_scheme, self.primary_block.report_to_specific_part
         )
 
-    @mock.patch.object(PrimaryBlock, "from_full_uri", return_value=(1, 2))
-    def test_full_source_uri_setter(self, mock_from_full_uri):
+    def test_full_source_uri_setter(self):
+        self.mock_from_full_uri.return_value = (1, 2)
         self.primary_block.full_source_uri = 42
-        self.assertTrue(mock_from_full_uri.called)
-        self.assertEqual(mock_from_full_uri.call_args[0][0], 42)
-        mock_from_full_uri.stop()
+        self.mock_from_full_uri.assert_called_once_with(42)
+        pb = self.primary_block
+        self.assertEqual((pb.source_scheme, pb.source_specific_part), (1, 2))
 
-    @mock.patch.object(PrimaryBlock, "from_full_uri", return_value=(3, 4))
-    def test_full_destination_uri_setter(self, mock_from_full_uri):
+    def test_full_destination_uri_setter(self):
+        self.mock_from_full_uri.return_value = (3, 4)
         self.primary_block.full_destination_uri = 42
-        self.assertTrue(mock_from_full_uri.called)
-        self.assertEqual(mock_from_full_uri.call_args[0][0], 42)
-        mock_from_full_uri.stop()
+        self.mock_from_full_uri.assert_called_once_with(42)
+        pb = self.primary_block
+        self.assertEqual((pb.destination_scheme, pb.destination_specific_part), (3, 4))
 
-    @mock.patch.object(PrimaryBlock, "from_full_uri", return_value=(5, 6))
-    def test_full_report_to_uri_setter(self, mock_from_full_uri):
+    def test_full_report_to_uri_setter(self):
+        self.mock_from_full_uri.return_value = (5, 6)
         self.primary_block.full_report_to_uri = 42
-        self.assertTrue(mock_from_full_uri.called)
-        self.assertEqual(mock_from_full_uri.call_args[0][0], 42)
+        self.mock_from_full_uri.assert_called_once_with(42)
+        pb = self.primary_block
+        self.assertEqual((pb.report_to_scheme, pb.report_to_specific_part), (5, 6))
 
 
 class TestCanonicalBlock(TestCase):
-    def setUp(self):
-        self.block_data_plb = (1, 1, 42, 0, b"123456790")
-        self.block_data_pnb = (6, 2, 42, 0, b"123456790")
-        self.block_data_bab = (7, 3, 42, 0, b"123456790")
-        self.block_data_hcb = (10, 4, 42, 0, b"123456790")
-        self.canonical_block_plb = PayloadBlock(1, 1, Flags(42), 0, b"123456790")
-        self.canonical_block_pnb = PreviousNodeBlock(6, 2, Flags(42), 0, b"123456790")
-        self.canonical_block_bab = BundleAgeBlock(7, 3, Flags(42), 0, b"123456790")
-        self.canonical_block_hcb = HopCountBlock(10, 4, Flags(42), 0, b"123456790")
+    @classmethod
+    def setUpClass(cls):
+        cls.block_data_plb = (1, 1, 42, 0, b"123456790")
+        cls.block_data_pnb = (6, 2, 42, 0, b"123456790")
+        cls.block_data_bab = (7, 3, 42, 0, b"123456790")
+        cls.block_data_hcb = (10, 4, 42, 0, b"123456790")
+        cls.canonical_block_plb = PayloadBlock(1, 1, Flags(42), 0, b"123456790")
+        cls.canonical_block_pnb = PreviousNodeBlock(6, 2, Flags(42), 0, b"123456790")
+        cls.canonical_block_bab = BundleAgeBlock(7, 3, Flags(42), 0, b"123456790")
+        cls.canonical_block_hcb = HopCountBlock(10, 4, Flags(42), 0, b"123456790")
 
     def test_from_block_data_returns_correct_types(self):
         self.assertTrue(
@@ -382,35 +582,29 @@ class TestCanonicalBlock(TestCase):
             CanonicalBlock.from_block_data(self.block_data_hcb), self.canonical_block_hcb
         )
 
-    @mock.patch("builtins.print")
-    def test_from_block_data_warnings_on_other_block_types(self, mock_print):
-        for block_type in range(11, 256):
-            block_data = [block_type, 23, 42, 0, b"0987654321"]
-            self.assertTrue(type(CanonicalBlock.from_block_data(block_data)) is CanonicalBlock)
-            self.assertTrue(mock_print.called)
+    def test_from_block_data_warnings_on_other_block_types(self):
+        block_types = (11, 12, 191, 192, 254, 255)
+        block_data = [0, 23, 42, 0, b"0987654321"]
+        output = StringIO()
+        with redirect_stdout(output):
+            for block_type in block_types:
+                with self.subTest(block_type=block_type):
+                    block_data[0] = block_type
+                    self.assertIs(type(CanonicalBlock.from_block_data(block_data)), CanonicalBlock)
+        self.assertEqual(len(output.getvalue().splitlines()), len(block_types))
 
     def test_from_block_data_errors_on_unimplemented_block_types(self):
-        for block_type in range(256, 10000):
-            block_data = [block_type, 23, 42, 0, b"0987654321"]
-            self.assertRaises(NotImplementedError, CanonicalBlock.from_block_data, block_data)
-        for block_type in range(-10000, 1):
-            block_data = [block_type, 23, 42, 0, b"0987654321"]
-            self.assertRaises(NotImplementedError, CanonicalBlock.from_block_data, block_data)
+        block_data = [0, 23, 42, 0, b"0987654321"]
+        for block_type in (256, 257, 9999, -10000, -1, 0):
+            with self.subTest(block_type=block_type):
+                block_data[0] = block_type
+                self.assertRaises(NotImplementedError, CanonicalBlock.from_block_data, block_data)
 
     def test_from_block_data_unsupported_lengths(self):
-        for ell in range(5):
-            self.assertRaises(
-                ValueError,
-                CanonicalBlock.from_block_data,
-                [0 for _ in range(ell)],
-            )
-        for ell in range(7, 1000):
-            self.assertRaises(
-                ValueError,
-                CanonicalBlock.from_block_data,
-                [0 for _ in range(ell)],
-            )
-        self.assertRaises(NotImplementedError, CanonicalBlock.from_block_data, [0] * 6)
+        for ell in (0, 1, 4, 7, 8, 999):
+            with self.subTest(length=ell):
+                self.assertRaises(ValueError, CanonicalBlock.from_block_data, ZEROS[:ell])
+        self.assertRaises(NotImplementedError, CanonicalBlock.from_block_data, ZEROS[:6])
 
     def test_to_block_data_returns_correct_block_data(self):
         self.assertEqual(
@@ -426,6 +620,10 @@ class TestCanonicalBlock(TestCase):
             CanonicalBlock.to_block_data(self.canonical_block_hcb), self.block_data_hcb
         )
 
+    def test_blocks_are_unhashable(self):
+        # blocks are mutable and compared by value, so they must not end up in sets or dict keys
+        self.assertRaises(TypeError, hash, self.canonical_block_bab)
+
     def test_bad_blocktype_from_block_data(self):
         bad_blocktype_block_data_plb = (10, 1, 42, 0, b"123456790")
         bad_blocktype_block_data_pnb = (1, 2, 42, 0, b"123456790")
@@ -440,23 +638,26 @@ class TestCanonicalBlock(TestCase):
 
 
 class TestPayloadBlock(TestCase):
-    def setUp(self):
-        self.payload_block = PayloadBlock(1, 1, Flags(42), 0, b"123456790")
+    @classmethod
+    def setUpClass(cls):
+        cls.payload_block = PayloadBlock(1, 1, Flags(42), 0, b"123456790")
 
     def test_from_objects_return_correct_bloc(self):
         self.assertEquals(PayloadBlock.from_objects(b"123456790", Flags(42)), self.payload_block)
 
+    def test_from_objects_default_flags_are_not_shared(self):
+        block = PayloadBlock.from_objects(b"123456790")
+        block.block_processing_control_flags.set_flag(0)
+        self.assertEqual(PayloadBlock.from_objects(b"").block_processing_control_flags.flags, 0)
+
 
 class TestPreviousNodeBlock(TestCase):
-    def setUp(self):
-        self.uri_1 = "dtn://node1/incoming"
-        self.uri_2 = "ipn://1234.5678"
-        self.prev_node_1 = PreviousNodeBlock(
-            6, 1, Flags(42), 0, dumps(PrimaryBlock.from_full_uri(self.uri_1))
-        )
-        self.prev_node_2 = PreviousNodeBlock(
-            6, 1, Flags(42), 0, dumps(PrimaryBlock.from_full_uri(self.uri_2))
-        )
+    @classmethod
+    def setUpClass(cls):
+        cls.uri_1 = "dtn://node1/incoming"
+        cls.uri_2 = "ipn://1234.5678"
+        cls.prev_node_1 = PreviousNodeBlock(6, 1, Flags(42), 0, CBOR_DTN_NODE_ID)
+        cls.prev_node_2 = PreviousNodeBlock(6, 1, Flags(42), 0, CBOR_IPN_NODE_ID)
 
     def test_previous_node_id_returns_correct_uri(self):
         self.assertEqual(self.prev_node_1.previous_node_id, [1, "//node1/incoming"])
@@ -466,11 +667,20 @@ class TestPreviousNodeBlock(TestCase):
         self.assertEqual(PreviousNodeBlock.from_objects(self.uri_1, Flags(42)), self.prev_node_1)
         self.assertEqual(PreviousNodeBlock.from_objects(self.uri_2, Flags(42)), self.prev_node_2)
 
+    def test_from_objects_encodes_long_node_ids(self):
+        # text string headers with one, two and three bytes
+        for length in (23, 24, 255, 256, 65535, 65536):
+            uri = "dtn://" + "a" * (length - 2)
+            block = PreviousNodeBlock.from_objects(uri, Flags(42))
+            self.assertEqual(block.data, dumps(PrimaryBlock.from_full_uri(uri)))
+            self.assertEqual(block.previous_node_id, [1, uri[4:]])
+
 
 class TestBundleAgeBlock(TestCase):
-    def setUp(self):
-        self.age = 1234567
-        self.bundle_age_block = BundleAgeBlock(7, 1, Flags(42), 0, dumps(self.age))
+    @classmethod
+    def setUpClass(cls):
+        cls.age = 1234567
+        cls.bundle_age_block = BundleAgeBlock(7, 1, Flags(42), 0, CBOR_AGE)
 
     def test_age_milliseconds_getter(self):
         self.assertEqual(self.age, self.bundle_age_block.age_milliseconds)
@@ -479,7 +689,7 @@ class TestBundleAgeBlock(TestCase):
         bab = BundleAgeBlock(7, 1, Flags(42), 0, dumps(0))
         self.assertEqual(loads(bab.data), 0)
         bab.age_milliseconds = self.age
-        self.assertEqual(self.age, self.bundle_age_block.age_milliseconds)
+        self.assertEqual(self.age, bab.age_milliseconds)
 
     def test_from_objects(self):
         bab_crit = BundleAgeBlock(7, 1, BlockProcessingControlFlags(42), 0, dumps(1337), None)
@@ -489,9 +699,10 @@ class TestBundleAgeBlock(TestCase):
 
 
 class TestHopCountBlock(TestCase):
-    def setUp(self):
-        self.hop_count = (98, 76)
-        self.hop_count_block = HopCountBlock(10, 1, Flags(42), 0, dumps(self.hop_count))
+    @classmethod
+    def setUpClass(cls):
+        cls.hop_count = (98, 76)
+        cls.hop_count_block = HopCountBlock(10, 1, Flags(42), 0, CBOR_HOP_COUNT)
 
     def test_from_objects_returns_correct_block(self):
         self.assertEqual(self.hop_count_block, HopCountBlock.from_objects(98, 76, Flags(42)))
@@ -512,11 +723,9 @@ class TestHopCountBlock(TestCase):
 class TestBundle(TestCase):
     def setUp(self):
         self.canonical_block_plb = PayloadBlock(1, 0, Flags(42), 0, b"123456790")
-        self.canonical_block_pnb = PreviousNodeBlock(
-            6, 0, Flags(42), 0, dumps(PrimaryBlock.from_full_uri("dtn://node1/incoming"))
-        )
-        self.canonical_block_bab = BundleAgeBlock(7, 0, Flags(42), 0, dumps(1234567))
-        self.canonical_block_hcb = HopCountBlock(10, 0, Flags(42), 0, dumps((98, 76)))
+        self.canonical_block_pnb = PreviousNodeBlock(6, 0, Flags(42), 0, CBOR_DTN_NODE_ID)
+        self.canonical_block_bab = BundleAgeBlock(7, 0, Flags(42), 0, CBOR_AGE)
+        self.canonical_block_hcb = HopCountBlock(10, 0, Flags(42), 0, CBOR_HOP_COUNT)
         self.primary_block = PrimaryBlock(
             version=7,
             bundle_processing_control_flags=BundleProcessingControlFlags(flags=CONTROL_FLAGS),
@@ -575,51 +784,83 @@ class TestBundle(TestCase):
 
     def test_unable_to_insert_second_instance_of_block(self):
         self.assertRaises(
-            ValueError, self.full_bundle.insert_canonical_block, deepcopy(self.canonical_block_bab)
+            ValueError, self.full_bundle.insert_canonical_block, copy_of(self.canonical_block_bab)
         )
         self.assertRaises(
-            ValueError, self.full_bundle.insert_canonical_block, deepcopy(self.canonical_block_plb)
+            ValueError, self.full_bundle.insert_canonical_block, copy_of(self.canonical_block_plb)
         )
         self.assertRaises(
-            ValueError, self.full_bundle.insert_canonical_block, deepcopy(self.canonical_block_pnb)
+            ValueError, self.full_bundle.insert_canonical_block, copy_of(self.canonical_block_pnb)
         )
         self.assertRaises(
-            ValueError, self.full_bundle.insert_canonical_block, deepcopy(self.canonical_block_hcb)
+            ValueError, self.full_bundle.insert_canonical_block, copy_of(self.canonical_block_hcb)
         )
 
-    def test_correct_bundle_id(self):
-        self.assertEqual(
-            self.full_bundle.bundle_id,
-            f"{URI_SCHEME_DTN_NAME}:{SOURCE_SPECIFIC_PART}-0-{SEQ_NUMBER}",
+    def test_second_instance_error_names_block_type(self):
+        self.assertRaisesRegex(
+            ValueError,
+            "BundleAgeBlock already present in this bundle",
+            self.full_bundle.insert_canonical_block,
+            BundleAgeBlock(7, 0, Flags(42), 0, dumps(1)),
         )
 
+    def test_correct_bundle_id(self):
+        self.assertEqual(self.full_bundle.bundle_id, EXPECTED_BUNDLE_ID)
+
+    def test_bundle_id_follows_primary_block_changes(self):
+        self.assertEqual(self.full_bundle.bundle_id, EXPECTED_BUNDLE_ID)
+        self.full_bundle.primary_block.sequence_number = SEQ_NUMBER + 1
+        self.full_bundle.primary_block.full_source_uri = "ipn://12.34"
+        self.assertEqual(self.full_bundle.bundle_id, f"ipn://12.34-0-{SEQ_NUMBER + 1}")
+
+    def test_bundle_id_follows_ipn_specific_part_changed_in_place(self):
+        # ipn specific parts decoded from CBOR are lists
+        self.full_bundle.primary_block.source_scheme = URI_SCHEME_IPN_ENCODED
+        self.full_bundle.primary_block.source_specific_part = [12, 34]
+        self.assertEqual(self.full_bundle.bundle_id, f"ipn://12.34-0-{SEQ_NUMBER}")
+        self.full_bundle.primary_block.source_specific_part[1] = 56
+        self.assertEqual(self.full_bundle.bundle_id, f"ipn://12.56-0-{SEQ_NUMBER}")
+
     def test_remove_present_block(self):
-        self.full_bundle.remove_block(deepcopy(self.primary_block))
+        self.full_bundle.remove_block(copy_of(self.primary_block))
         self.assertIsNone(self.full_bundle.primary_block)
-        self.full_bundle.remove_block(deepcopy(self.canonical_block_bab))
+        self.full_bundle.remove_block(copy_of(self.canonical_block_bab))
         self.assertIsNone(self.full_bundle.bundle_age_block)
-        self.full_bundle.remove_block(deepcopy(self.canonical_block_pnb))
+        self.full_bundle.remove_block(copy_of(self.canonical_block_pnb))
         self.assertIsNone(self.full_bundle.previous_node_block)
-        self.full_bundle.remove_block(deepcopy(self.canonical_block_plb))
+        self.full_bundle.remove_block(copy_of(self.canonical_block_plb))
         self.assertIsNone(self.full_bundle.payload_block)
-        self.full_bundle.remove_block(deepcopy(self.canonical_block_hcb))
+        self.full_bundle.remove_block(copy_of(self.canonical_block_hcb))
         self.assertIsNone(self.full_bundle.hop_count_block)
 
         target_length = len(self.full_bundle.other_blocks) - 1
         self.full_bundle.remove_block(CanonicalBlock(192, 5, Flags(37), 0, b"123123123"))
         self.assertEqual(len(self.full_bundle.other_blocks), target_length)
 
+    def test_remove_block_by_identity(self):
+        self.full_bundle.remove_block(self.canonical_block_hcb)
+        self.assertIsNone(self.full_bundle.hop_count_block)
+        other_block = self.full_bundle.other_blocks[2]
+        self.full_bundle.remove_block(other_block)
+        self.assertNotIn(other_block, self.full_bundle.other_blocks)
+
+    def test_remove_block_keeps_unequal_blocks(self):
+        self.full_bundle.remove_block(BundleAgeBlock(7, 3, Flags(42), 0, dumps(1)))
+        self.assertIs(self.full_bundle.bundle_age_block, self.canonical_block_bab)
+        self.full_bundle.remove_block(CanonicalBlock(192, 5, Flags(0), 0, b""))
+        self.assertEqual(len(self.full_bundle.other_blocks), 4)
+
     def test_remove_missing_bundle(self):
-        pb = deepcopy(self.primary_block)
+        pb = copy_of(self.primary_block)
         pb.bundle_creation_time = 1234567
         bundle = Bundle(pb)
-        bundle.remove_block(deepcopy(self.canonical_block_bab))
+        bundle.remove_block(copy_of(self.canonical_block_bab))
         self.assertIsNone(bundle.bundle_age_block)
-        bundle.remove_block(deepcopy(self.canonical_block_pnb))
+        bundle.remove_block(copy_of(self.canonical_block_pnb))
         self.assertIsNone(bundle.previous_node_block)
-        bundle.remove_block(deepcopy(self.canonical_block_plb))
+        bundle.remove_block(copy_of(self.canonical_block_plb))
         self.assertIsNone(bundle.payload_block)
-        bundle.remove_block(deepcopy(self.canonical_block_hcb))
+        bundle.remove_block(copy_of(self.canonical_block_hcb))
         self.assertIsNone(bundle.hop_count_block)
 
         bundle.remove_block(CanonicalBlock(192, 5, Flags(37), 0, b"123123123"))
@@ -636,6 +877,10 @@ class TestBundle(TestCase):
         )
         self.assertEqual(bundle_crit, Bundle.from_block_data([0, 0]))
 
+    def test_from_cbor_stream(self):
+        data = self.full_bundle.to_cbor()
+        self.assertEqual(Bundle.from_cbor_stream(BytesIO(data)), Bundle.from_cbor(data))
+
     def test_insert_unknown_blocktype(self):
         class UnknownBlock(CanonicalBlock):
             pass
@@ -647,23 +892,61 @@ class TestBundle(TestCase):
         )
 
     def test_insert_other_block_into_botched_other_block_field(self):
-        bad_bundle = deepcopy(self.full_bundle)
+        bad_bundle = copy_of(self.full_bundle)
         bad_bundle.other_blocks = None
         new_block = CanonicalBlock(192, 0, Flags(37), 0, b"123123123")
         bad_bundle.insert_canonical_block(new_block)
         self.assertEqual(bad_bundle.other_blocks[0], new_block)
 
     def test_eq_operator(self):
-        bundle1 = deepcopy(self.full_bundle)
+        bundle1 = copy_of(self.full_bundle)
+        # compared before the bundles below renumber the shared fixture blocks
+        self.assertEqual(bundle1, self.full_bundle)
         bundle2_1 = Bundle(
             primary_block=self.primary_block, bundle_age_block=self.canonical_block_bab
         )
         bundle2_2 = Bundle(
             primary_block=self.primary_block, bundle_age_block=self.canonical_block_bab
         )
-        self.assertTrue(bundle1, self.full_bundle)
         self.assertEqual(bundle2_1, bundle2_2)
 
+    def test_eq_other_blocks_in_any_order(self):
+        bundle = copy_of(self.full_bundle)
+        bundle.other_blocks.reverse()
+        self.assertEqual(bundle, self.full_bundle)
+        bundle.other_blocks[0] = bundle.other_blocks[1]
+        self.assertNotEqual(bundle, self.full_bundle)
+
+    def test_eq_bytearray_payloads(self):
+        bundles = [
+            Bundle(
+                primary_block=copy_of(self.primary_block),
+                bundle_age_block=copy_of(self.canonical_block_bab),
+                payload_block=PayloadBlock(1, 0, Flags(42), 0, bytearray(b"123456790")),
+                other_blocks=[CanonicalBlock(192, 0, Flags(37), 0, bytearray(b"123123123"))],
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual(bundles[0], bundles[1])
+        bundles[1].other_blocks[0].data[0] = 0
+        self.assertNotEqual(bundles[0], bundles[1])
+
+    def test_eq_other_blocks_with_equal_data_of_other_types(self):
+        # 1, 1.0 and True compare equal, but each has its own CBOR encoding
+        bundles = [
+            Bundle(
+                primary_block=copy_of(self.primary_block),
+                bundle_age_block=copy_of(self.canonical_block_bab),
+                other_blocks=[
+                    CanonicalBlock(192, 0, Flags(37), 0, b"123"),
+                    CanonicalBlock(193, 0, Flags(37), 0, number),
+                ],
+            )
+            for number in (1, 1.0, True)
+        ]
+        self.assertEqual(bundles[0], bundles[1])
+        self.assertEqual(bundles[0], bundles[2])
+
     def test_not_eq(self):
         bundle = Bundle(primary_block=self.primary_block, bundle_age_block=self.canonical_block_bab)
         self.assertFalse(bundle == self.full_bundle)
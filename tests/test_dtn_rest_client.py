@@ -0,0 +1,258 @@
+import json
+from io import BytesIO, RawIOBase
+from unittest import mock
+
+import pytest
+
+from py_dtn7 import Bundle, DTNRESTClient
+from py_dtn7.bundle import PayloadBlock, PrimaryBlock
+
+BASE_URL: str = "http://localhost:3000"
+NODE_ID: str = "dtn://node1/"
+
+
+def bundle_cbor(seq: int) -> bytes:
+    bundle = Bundle(
+        primary_block=PrimaryBlock.from_objects(
+            "dtn://node2/incoming", NODE_ID, bundle_creation_time=1000, sequence_number=seq
+        ),
+        payload_block=PayloadBlock.from_objects(f"payload {seq}".encode()),
+    )
+    return bundle.to_cbor()
+
+
+def bundle_id(seq: int) -> str:
+    return f"{NODE_ID}-1000-{seq}"
+
+
+class ChunkedStream(RawIOBase):
+    """A raw response body that hands out at most `chunk_size` bytes per read like a socket"""
+
+    def __init__(self, content: bytes, chunk_size: int):
+        self._body = BytesIO(content)
+        self._chunk_size = chunk_size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._body.readinto(memoryview(buffer)[: self._chunk_size])
+
+
+class DecompressingStream(ChunkedStream):
+    """A raw response body that also returns empty reads before its end, like urllib3 does while
+    it decompresses a body"""
+
+    def __init__(self, content: bytes, chunk_size: int):
+        super().__init__(content, chunk_size)
+        self._reads = 0
+
+    def readinto(self, buffer) -> int:
+        self._reads += 1
+        return 0 if self._reads % 2 == 0 else super().readinto(buffer)
+
+
+class FakeDTNd:
+    """Answers the session requests of a DTNRESTClient from an in-memory bundle store"""
+
+    def __init__(self):
+        self.store = []
+        self.downloads = []
+        # peer name -> specific part of its node ID
+        self.peers = {}
+        self.peer_requests = 0
+        self.streamed = []
+        # bytes per read of a streamed download
+        self.chunk_size = 3
+        self.content_encoding = None
+
+    def get(self, url: str, **kwargs) -> mock.Mock:
+        if url == BASE_URL + DTNRESTClient.STATUS_BUNDLES:
+            content = ("[" + ",".join(f'"{bundle_id(seq)}"' for seq in self.store) + "]").encode()
+        elif url == BASE_URL + DTNRESTClient.STATUS_PEERS:
+            self.peer_requests += 1
+            peers = {name: {"eid": [1, eid]} for name, eid in self.peers.items()}
+            content = json.dumps(peers).encode()
+        elif url.startswith(BASE_URL + DTNRESTClient.DOWNLOAD_ENDPOINT + "?"):
+            seq = int(url.rsplit("-", 1)[1])
+            self.downloads.append(seq)
+            content = bundle_cbor(seq)
+        else:
+            raise AssertionError(f"unexpected request to {url}")
+        response = mock.Mock(status_code=200, content=content, headers={})
+        if kwargs.get("stream"):
+            if self.content_encoding is None:
+                # the body can only be read from the raw stream
+                response.raw = ChunkedStream(content, self.chunk_size)
+                response.content = None
+            else:
+                response.headers["Content-Encoding"] = self.content_encoding
+                response.raw = DecompressingStream(content, self.chunk_size)
+            self.streamed.append(response)
+        return response
+
+
+@pytest.fixture
+def dtnd():
+    return FakeDTNd()
+
+
+@pytest.fixture
+def client(dtnd):
+    with mock.patch.object(DTNRESTClient, "_get_nodeid", return_value=NODE_ID):
+        rest_client = DTNRESTClient()
+    rest_client._session = mock.Mock(get=mock.Mock(side_effect=dtnd.get))
+    return rest_client
+
+
+def sequence_numbers(bundles) -> list:
+    return [bundle.primary_block.sequence_number for bundle in bundles]
+
+
+def test_get_all_bundles_downloads_each_bundle_once(client, dtnd):
+    dtnd.store = [3, 1, 2]
+    assert sequence_numbers(client.get_all_bundles()) == [3, 1, 2]
+    assert sorted(dtnd.downloads) == [1, 2, 3]
+    dtnd.downloads.clear()
+    assert sequence_numbers(client.get_all_bundles()) == [3, 1, 2]
+    assert dtnd.downloads == []
+
+
+def test_get_all_bundles_evicts_removed_bundles(client, dtnd):
+    dtnd.store = [1, 2, 3]
+    client.get_all_bundles()
+    dtnd.downloads.clear()
+    dtnd.store = [3, 4]
+    assert sequence_numbers(client.get_all_bundles()) == [3, 4]
+    assert dtnd.downloads == [4]
+    assert set(client._bundle_data) == {bundle_id(3), bundle_id(4)}
+
+
+def test_get_all_bundles_keeps_store_order(client, dtnd):
+    # more new bundles than download workers, cached and new bundles interleaved
+    dtnd.store = [5, 7]
+    client.get_all_bundles()
+    dtnd.store = [20, 7, 13, 1, 5, 18, 2, 11, 9, 16, 4, 6]
+    assert sequence_numbers(client.get_all_bundles()) == dtnd.store
+    assert set(client._bundle_data) == {bundle_id(seq) for seq in dtnd.store}
+
+
+def test_get_all_bundles_returns_independent_bundles(client, dtnd):
+    dtnd.store = [1]
+    first = client.get_all_bundles()[0]
+    first.primary_block.sequence_number = 99
+    assert sequence_numbers(client.get_all_bundles()) == [1]
+
+
+@mock.patch("py_dtn7.dtn_rest_client.monotonic")
+def test_get_json_reuses_response_until_ttl_expires(mock_monotonic, client, dtnd):
+    mock_monotonic.return_value = 100.0
+    first = client._get_json(DTNRESTClient.STATUS_PEERS, ttl=2.0)
+    mock_monotonic.return_value = 101.9
+    assert client._get_json(DTNRESTClient.STATUS_PEERS, ttl=2.0) is first
+    assert dtnd.peer_requests == 1
+    mock_monotonic.return_value = 102.0
+    assert client._get_json(DTNRESTClient.STATUS_PEERS, ttl=2.0) is not first
+    assert dtnd.peer_requests == 2
+    # the refetched response is cached from the time it was fetched
+    mock_monotonic.return_value = 103.9
+    client._get_json(DTNRESTClient.STATUS_PEERS, ttl=2.0)
+    assert dtnd.peer_requests == 2
+
+
+@mock.patch("py_dtn7.dtn_rest_client.monotonic", return_value=100.0)
+def test_get_json_without_ttl_always_fetches(mock_monotonic, client, dtnd):
+    for _ in range(3):
+        client._get_json(DTNRESTClient.STATUS_PEERS)
+    assert dtnd.peer_requests == 3
+    client._get_json(DTNRESTClient.STATUS_PEERS, ttl=0)
+    assert dtnd.peer_requests == 4
+    assert client._cache == {}
+
+
+@mock.patch("py_dtn7.dtn_rest_client.monotonic", return_value=100.0)
+def test_invalidate_cache_drops_cached_responses(mock_monotonic, client, dtnd):
+    client._get_json(DTNRESTClient.STATUS_PEERS, ttl=60.0)
+    client.invalidate_cache()
+    assert client._cache == {}
+    client._get_json(DTNRESTClient.STATUS_PEERS, ttl=60.0)
+    assert dtnd.peer_requests == 2
+
+
+@mock.patch("py_dtn7.dtn_rest_client.monotonic")
+def test_resolve_peer_follows_eid_changes_after_ttl(mock_monotonic, client, dtnd):
+    dtnd.peers = {"peer1": "//node2/"}
+    mock_monotonic.return_value = 100.0
+    assert client._resolve_peer("peer1") == "dtn://node2/"
+    dtnd.peers = {"peer1": "//node3/"}
+    # within the TTL the cached peer list is used
+    mock_monotonic.return_value = 100.0 + DTNRESTClient.PEERS_CACHE_TTL / 2
+    assert client._resolve_peer("peer1") == "dtn://node2/"
+    assert dtnd.peer_requests == 1
+    mock_monotonic.return_value = 100.0 + DTNRESTClient.PEERS_CACHE_TTL
+    assert client._resolve_peer("peer1") == "dtn://node3/"
+    assert dtnd.peer_requests == 2
+
+
+@mock.patch("py_dtn7.dtn_rest_client.monotonic", return_value=100.0)
+def test_resolve_peer_forgets_removed_peers_after_invalidation(mock_monotonic, client, dtnd):
+    dtnd.peers = {"peer1": "//node2/", "peer2": "//node3/"}
+    assert client._resolve_peer("peer2") == "dtn://node3/"
+    dtnd.peers = {"peer1": "//node2/"}
+    client.invalidate_cache()
+    with pytest.raises(ValueError):
+        client._resolve_peer("peer2")
+    assert client._resolve_peer("peer1") == "dtn://node2/"
+
+
+@mock.patch("py_dtn7.dtn_rest_client.monotonic", return_value=100.0)
+def test_peers_cannot_be_changed_through_the_returned_dict(mock_monotonic, client, dtnd):
+    dtnd.peers = {"peer1": "//node2/"}
+    client.peers.clear()
+    assert list(client.peers) == ["peer1"]
+    assert client._resolve_peer("peer1") == "dtn://node2/"
+    assert dtnd.peer_requests == 1
+
+
+def test_iter_bundles_decodes_streamed_responses(client, dtnd):
+    dtnd.store = [2, 9, 4]
+    bundles = list(client.iter_bundles())
+    assert sequence_numbers(bundles) == [2, 9, 4]
+    assert [bundle.payload_block.data for bundle in bundles] == [
+        b"payload 2",
+        b"payload 9",
+        b"payload 4",
+    ]
+    assert len(dtnd.streamed) == 3
+    for response in dtnd.streamed:
+        response.close.assert_called_once_with()
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 7))
+def test_iter_bundles_fills_short_reads(client, dtnd, chunk_size):
+    dtnd.store = [2, 9]
+    dtnd.chunk_size = chunk_size
+    assert sequence_numbers(client.iter_bundles()) == [2, 9]
+
+
+def test_iter_bundles_decodes_compressed_responses_in_full(client, dtnd):
+    # the empty reads of a decompressing stream would end decoding early
+    dtnd.store = [2, 9]
+    dtnd.content_encoding = "gzip"
+    assert sequence_numbers(client.iter_bundles()) == [2, 9]
+    assert len(dtnd.streamed) == 2
+
+
+def test_iter_bundles_closes_response_when_stopped_early(client, dtnd):
+    dtnd.store = [1, 2, 3]
+    bundles = client.iter_bundles()
+    assert next(bundles).primary_block.sequence_number == 1
+    bundles.close()
+    assert len(dtnd.streamed) == 1
+    dtnd.streamed[0].close.assert_called_once_with()
+
+
+def test_from_cbor_stream_reads_consecutive_bundles():
+    stream = BytesIO(b"".join(bundle_cbor(seq) for seq in (1, 2, 3)))
+    assert sequence_numbers(Bundle.from_cbor_stream(stream) for _ in range(3)) == [1, 2, 3]
+    assert stream.read() == b""
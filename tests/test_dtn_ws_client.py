@@ -0,0 +1,216 @@
+import importlib.util
+import json
+import socket
+import sys
+from base64 import b64encode
+from unittest import mock
+
+import cbor2
+import pytest
+from websocket import ABNF
+
+from py_dtn7.dtn_ws_client import DTNWSClient, WSMode, _bundle_to_cbor, _bundle_to_json
+
+SRC: str = "dtn://node1/sender"
+DST: str = "dtn://node2/incoming"
+# the widths of a CBOR head change between each of these neighbours
+WIDTH_BOUNDARIES = (0, 23, 24, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 2**64 - 1)
+
+
+def cbor2_bundle(src, dst, delivery_notification, lifetime, data) -> bytes:
+    """The data mode bundle as encoded by cbor2, which _bundle_to_cbor must reproduce exactly"""
+    return cbor2.dumps(
+        {
+            "src": src,
+            "dst": dst,
+            "delivery_notification": delivery_notification,
+            "lifetime": lifetime,
+            "data": data,
+        }
+    )
+
+
+@pytest.mark.parametrize("lifetime", WIDTH_BOUNDARIES)
+def test_bundle_to_cbor_lifetimes(lifetime):
+    args = (SRC, DST, False, lifetime, b"payload")
+    assert _bundle_to_cbor(*args) == cbor2_bundle(*args)
+
+
+# payloads of 2**32 bytes and more cannot be allocated here, the heads for their lengths are
+# covered by the _cbor_head tests
+@pytest.mark.parametrize("length", WIDTH_BOUNDARIES[:7])
+@pytest.mark.parametrize("payload_type", (bytes, bytearray))
+def test_bundle_to_cbor_payload_lengths(length, payload_type):
+    args = (SRC, DST, True, 1000, payload_type(length))
+    assert _bundle_to_cbor(*args) == cbor2_bundle(*args)
+
+
+@pytest.mark.parametrize("length", (0, 24, 65536))
+def test_bundle_to_cbor_memoryview_payload(length):
+    data = bytes(range(256)) * (length // 256) + bytes(length % 256)
+    # cbor2 encodes the same payload as bytes, a memoryview must not change the wire format
+    assert _bundle_to_cbor(SRC, DST, False, 1000, memoryview(data)) == cbor2_bundle(
+        SRC, DST, False, 1000, data
+    )
+
+
+@pytest.mark.parametrize(
+    "src,dst",
+    (
+        ("", ""),
+        ("", DST),
+        (SRC, ""),
+        ("dtn://knoten/grüße", "dtn://节点/📦"),
+        # 24 characters, but far more UTF-8 bytes, so the head must count bytes
+        ("dtn://" + "ä" * 18, "dtn://" + "€" * 100),
+    ),
+)
+def test_bundle_to_cbor_endpoint_strings(src, dst):
+    args = (src, dst, False, 1000, b"payload")
+    assert _bundle_to_cbor(*args) == cbor2_bundle(*args)
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        (None, DST, False, 1000, b"payload"),
+        (SRC, DST, 1, 1000, b"payload"),
+        (SRC, DST, False, 1000.0, b"payload"),
+        (SRC, DST, False, -1, b"payload"),
+        (SRC, DST, False, 2**64, b"payload"),
+        (SRC, DST, False, True, b"payload"),
+        (SRC, DST, False, 1000, "payload"),
+        (SRC, DST, False, 1000, [1, 2, 3]),
+    ),
+)
+def test_bundle_to_cbor_falls_back_to_cbor2(args):
+    assert _bundle_to_cbor(*args) == cbor2_bundle(*args)
+
+
+@pytest.fixture(
+    scope="module",
+    params=((), ("orjson",), ("pybase64",), ("orjson", "pybase64")),
+    ids=("installed", "without-orjson", "without-pybase64", "stdlib-only"),
+)
+def ws_client_module(request):
+    """A separately loaded dtn_ws_client module that could not import the given optional modules"""
+    spec = importlib.util.find_spec("py_dtn7.dtn_ws_client")
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, dict.fromkeys(request.param)):
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("payload_type", (bytes, bytearray, memoryview))
+@pytest.mark.parametrize("src", (SRC, "", "dtn://knoten/grüße"))
+def test_bundle_to_json_round_trips(ws_client_module, payload_type, src):
+    data: bytes = bytes(range(256)) * 3
+    encoded: bytes = ws_client_module._bundle_to_json(src, DST, True, 1000, payload_type(data))
+    # the JSON mode bundle as it was built before the base64 text was spliced in
+    expected: str = json.dumps(
+        {
+            "src": src,
+            "dst": DST,
+            "delivery_notification": True,
+            "lifetime": 1000,
+            "data": b64encode(data).decode("utf-8"),
+        }
+    )
+    assert list(json.loads(encoded).items()) == list(json.loads(expected).items())
+
+
+def test_bundle_to_json_refuses_other_payload_types(ws_client_module):
+    with pytest.raises(TypeError):
+        ws_client_module._bundle_to_json(SRC, DST, False, 1000, "payload")
+
+
+@pytest.fixture
+def client():
+    """A data mode client with a mocked websocket, the node ID is given so nothing connects"""
+    ws_client = DTNWSClient(callback=print, node_id="dtn://node1/")
+    ws_client._ws = mock.Mock()
+    return ws_client
+
+
+def test_endpoints_from_a_generator():
+    endpoints = (f"dtn://node1/{name}" for name in ("a", "b"))
+    ws_client = DTNWSClient(callback=print, endpoints=endpoints, node_id="dtn://node1/")
+    assert ws_client._endpoints == ["dtn://node1/a", "dtn://node1/b"]
+    assert ws_client._subscribe_cmds == [
+        b"/subscribe dtn://node1/a",
+        b"/subscribe dtn://node1/b",
+    ]
+
+
+def sent_payloads(ws: mock.Mock) -> list:
+    return [c.args[0] for c in ws.send.call_args_list]
+
+
+@mock.patch("py_dtn7.dtn_ws_client._TCP_CORK", 3)
+def test_send_data_batch_corks_around_sends(client):
+    calls = mock.Mock()
+    client._ws.sock.sock.setsockopt = calls.setsockopt
+    client._ws.send = calls.send
+    client.send_data_batch([{"destination": DST, "data": b"1"}, {"destination": DST, "data": b"2"}])
+    assert [c[0] for c in calls.mock_calls] == ["setsockopt", "send", "send", "setsockopt"]
+    assert calls.setsockopt.call_args_list == [
+        mock.call(socket.IPPROTO_TCP, 3, 1),
+        mock.call(socket.IPPROTO_TCP, 3, 0),
+    ]
+    assert calls.send.call_args_list == [
+        mock.call(
+            cbor2_bundle("dtn://node1/", DST, False, 24 * 3600 * 1000, data),
+            opcode=ABNF.OPCODE_BINARY,
+        )
+        for data in (b"1", b"2")
+    ]
+
+
+@mock.patch("py_dtn7.dtn_ws_client._TCP_CORK", 3)
+def test_send_data_batch_uncorks_when_sending_fails(client):
+    client._ws.send.side_effect = [None, ConnectionError]
+    with pytest.raises(ConnectionError):
+        client.send_data_batch([{"destination": DST, "data": b"1"}] * 3)
+    assert client._ws.send.call_count == 2
+    assert client._ws.sock.sock.setsockopt.call_args_list[-1] == mock.call(socket.IPPROTO_TCP, 3, 0)
+
+
+@mock.patch("py_dtn7.dtn_ws_client._TCP_CORK", 3)
+def test_send_data_batch_encodes_before_corking(client):
+    # the third bundle cannot be encoded in JSON mode, so nothing of the batch is sent
+    client._mode = WSMode.JSON_MODE
+    client._encode_payload = _bundle_to_json
+    bundles = [{"destination": DST, "data": b"1"}, {"destination": DST, "data": b"2"}]
+    with pytest.raises(TypeError):
+        client.send_data_batch(bundles + [{"destination": DST, "data": "3"}])
+    client._ws.send.assert_not_called()
+    client._ws.sock.sock.setsockopt.assert_not_called()
+
+
+@pytest.mark.parametrize("sock", (None, mock.Mock(sock=None)))
+@mock.patch("py_dtn7.dtn_ws_client._TCP_CORK", 3)
+def test_send_data_batch_without_socket(client, sock):
+    client._ws.sock = sock
+    client.send_data_batch([{"destination": DST, "data": b"1"}] * 3)
+    assert client._ws.send.call_count == 3
+
+
+@mock.patch("py_dtn7.dtn_ws_client._TCP_CORK", None)
+def test_send_data_batch_without_tcp_cork(client):
+    client.send_data_batch([{"destination": DST, "data": b"1"}] * 3)
+    assert client._ws.send.call_count == 3
+    client._ws.sock.sock.setsockopt.assert_not_called()
+
+
+def test_send_data_batch_memoryview_payloads(client):
+    data: bytes = bytes(range(256))
+    client.send_data_batch(
+        [
+            {"destination": DST, "data": memoryview(data)},
+            {"destination": DST, "data": memoryview(data)[16:48]},
+        ]
+    )
+    assert sent_payloads(client._ws) == [
+        cbor2_bundle("dtn://node1/", DST, False, 24 * 3600 * 1000, payload)
+        for payload in (data, data[16:48])
+    ]
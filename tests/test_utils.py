@@ -1,19 +1,68 @@
 from datetime import datetime, timezone
 
+import cbor2
+import pytest
+
 from py_dtn7 import from_dtn_timestamp, to_dtn_timestamp
+from py_dtn7.utils import _cbor_head
+
+# 2000-01-01 04:20:00 +0000 (UTC) as a DTN timestamp and as a datetime
+EXPECTED_TS: int = 4 * 3600 * 1000 + 20 * 60 * 1000
+EXPECTED_DT: datetime = datetime(
+    year=2000, month=1, day=1, hour=4, minute=20, second=0, tzinfo=timezone.utc
+)
+# the widths of a CBOR head change between each of these neighbours
+WIDTH_BOUNDARIES = (0, 23, 24, 255, 256, 65535, 65536, 2**32 - 1, 2**32, 2**64 - 1)
 
 
 def test_from_dtn_timestamp():
-    ts: int = 4 * 3600 * 1000 + 20 * 60 * 1000
-    correct_dt: datetime = datetime(
-        year=2000, month=1, day=1, hour=4, minute=20, second=0, tzinfo=timezone.utc
-    )
-    assert from_dtn_timestamp(ts) == correct_dt
+    assert from_dtn_timestamp(EXPECTED_TS) == EXPECTED_DT
 
 
 def test_to_dtn_timestamp():
-    correct_ts: int = 4 * 3600 * 1000 + 20 * 60 * 1000
+    assert to_dtn_timestamp(EXPECTED_DT) == EXPECTED_TS
+
+
+def test_to_dtn_timestamp_truncates_to_milliseconds():
+    dt: datetime = datetime(year=2000, month=1, day=1, microsecond=1999, tzinfo=timezone.utc)
+    assert to_dtn_timestamp(dt) == 1
+
+
+def test_to_dtn_timestamp_exact_for_distant_dates():
     dt: datetime = datetime(
-        year=2000, month=1, day=1, hour=4, minute=20, second=0, tzinfo=timezone.utc
+        year=4921,
+        month=12,
+        day=6,
+        hour=18,
+        minute=14,
+        second=46,
+        microsecond=436994,
+        tzinfo=timezone.utc,
     )
-    assert to_dtn_timestamp(dt) == correct_ts
+    assert from_dtn_timestamp(to_dtn_timestamp(dt)) == dt.replace(microsecond=436000)
+
+
+def cbor2_head(major_type: int, argument: int) -> bytes:
+    """The head cbor2 writes for an item of the given major type and argument"""
+    if major_type == 0x00:
+        return cbor2.dumps(argument)
+    if major_type == 0x20:
+        return cbor2.dumps(-1 - argument)
+    # strings are followed by their content, which is cut off again
+    item = bytes(argument) if major_type == 0x40 else "a" * argument
+    encoded: bytes = cbor2.dumps(item)
+    return encoded[: len(encoded) - argument]
+
+
+@pytest.mark.parametrize("argument", WIDTH_BOUNDARIES)
+@pytest.mark.parametrize("major_type", (0x00, 0x20))
+def test_cbor_head_integers(major_type, argument):
+    assert _cbor_head(major_type, argument) == cbor2_head(major_type, argument)
+
+
+# strings of 2**32 and more bytes cannot be allocated here, their heads only differ from the
+# integer heads above in the major type bits
+@pytest.mark.parametrize("argument", WIDTH_BOUNDARIES[:7])
+@pytest.mark.parametrize("major_type", (0x40, 0x60))
+def test_cbor_head_strings(major_type, argument):
+    assert _cbor_head(major_type, argument) == cbor2_head(major_type, argument)